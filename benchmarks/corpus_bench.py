@@ -0,0 +1,68 @@
+"""
+Compare a word file read into a tuple and as a language pack.
+
+A big corpus is generated in a temporary directory, then both are loaded
+with their sampler, measuring the time and the memory allocated by Python
+(the mapped words are in the page cache, not in the heap). The pack is
+compiled the first time and only opened the second one.
+Run it from the project directory:
+    python3 benchmarks/corpus_bench.py [words]
+"""
+from os.path import dirname, join
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import sys
+import tracemalloc
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from corpus import PackCorpus  # noqa: E402
+from language_packs import LanguageRegistry  # noqa: E402
+from word_pool import WordPool  # noqa: E402
+from word_sampler import WeightedSampler  # noqa: E402
+
+
+def write_corpus(file_name: str, count: int) -> None:
+    """Write the received number of unique random words, one per line"""
+    random: Random = Random(1)
+    letters: str = "abcdefghijklmnopqrstuvwxyz"
+    with open(file=file_name, mode="w") as file:
+        for idx in range(count):
+            length: int = random.randint(1, 12)
+            word: str = "".join(random.choice(letters) for _ in range(length))
+            file.write(f"{word}{idx}\n")
+    return None
+
+
+def measure(name: str, load) -> None:
+    """Print the time and the peak memory of loading and sampling a line"""
+    tracemalloc.start()
+    start: float = perf_counter()
+    words = load()
+    sampler: WeightedSampler = WeightedSampler(words)
+    sampler.fill_line(Random(1), 40)
+    elapsed: float = perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>13}: {elapsed:7.3f} s, {current / 2 ** 20:7.1f} MiB kept, "
+          f"{peak / 2 ** 20:7.1f} MiB peak")
+    del sampler  # Packs can't be closed while their views are used
+    if isinstance(words, PackCorpus):
+        words.close()
+    return None
+
+
+def main(count: int = 1_000_000) -> None:
+    """Measure every way of loading the corpus, building and reusing it"""
+    with TemporaryDirectory() as directory:
+        write_corpus(join(directory, "big_words.txt"), count)
+        print(f"{count} words")
+        measure("tuple", lambda: WordPool(directory).get("big_words.txt"))
+        measure("pack, build", lambda: LanguageRegistry(directory).get("big"))
+        measure("pack", lambda: LanguageRegistry(directory).get("big"))
+    return None
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,64 @@
+"""
+Measure the cost of 'MainUI.check_typing' per key.
+
+Run it from the project directory (a display is required by Tkinter):
+    python3 benchmarks/keystroke_bench.py
+To compare with the code before the constant per-key work, run it against
+a checkout of that commit too (its files are used, run it from there):
+    git worktree add /tmp/before 49fac7b~1
+    cd /tmp/before && python3 /path/to/benchmarks/keystroke_bench.py --src src
+"""
+from os.path import abspath, dirname, join
+from time import perf_counter_ns
+from tkinter import Tk
+import argparse
+import sys
+
+
+class KeyEvent:
+    def __init__(self, char: str):
+        self.char: str = char
+        self.keysym: str = char
+
+
+def main(keys: int = 20000) -> None:
+    """Feed synthetic keys to 'check_typing' and print the per-key cost"""
+    from ui import UI  # From the source directory of the arguments
+    root: Tk = Tk()
+    ui: UI = UI(root=root)
+    root.update()  # Finish the startup (login frame)
+    ui.switch_frame("MainUI")
+    frame = ui.current_frame
+    frame.set_time_variable(3600)
+    frame.start_typing_test(KeyEvent("Return"))
+    timings: list = []
+    for idx in range(keys):
+        expected: str = frame.text_engine.current_char()
+        event: KeyEvent = KeyEvent(expected if idx % 10 else "#")
+        start: int = perf_counter_ns()
+        frame.check_typing(event)
+        timings.append(perf_counter_ns() - start)
+    start: int = perf_counter_ns()
+    root.update()  # Pending widget refreshes are flushed here
+    flush: int = perf_counter_ns() - start
+    timings.sort()
+    print(f"keys: {keys}")
+    print(f"mean: {sum(timings) / keys / 1000:.2f} us")
+    print(f"p50: {timings[keys // 2] / 1000:.2f} us")
+    print(f"p99: {timings[int(keys * 0.99)] / 1000:.2f} us")
+    print(f"flush: {flush / 1000:.2f} us")
+    root.destroy()
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--src",
+        default=join(dirname(dirname(abspath(__file__))), "src"),
+        help="source directory to measure (default: this project's)"
+    )
+    parser.add_argument("--keys", type=int, default=20000)
+    args = parser.parse_args()
+    sys.path.insert(0, abspath(args.src))
+    main(args.keys)
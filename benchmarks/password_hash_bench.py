@@ -0,0 +1,27 @@
+"""
+Measure the password hashing cost and tune it against a latency target.
+
+Run it from the project directory:
+    python3 benchmarks/password_hash_bench.py [target_ms]
+"""
+from os.path import dirname, join
+import sys
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from password_hasher import PasswordHasher  # noqa: E402
+
+
+def main(target_ms: float = 250) -> None:
+    """Print the cost of the current iterations and the tuned ones"""
+    hasher: PasswordHasher = PasswordHasher(root=None)
+    current: float = hasher.measure(hasher.iterations)
+    print(f"current: {hasher.iterations} iterations, {current:.1f} ms")
+    tuned: int = hasher.tune(target_ms)
+    print(f"target: {target_ms} ms -> {tuned} iterations, "
+          f"{hasher.measure(tuned):.1f} ms")
+    return None
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,66 @@
+"""
+Measure the size and the cost of the session recordings.
+
+Every synthetic typist types a one minute session that is recorded into a
+temporary directory, then the recording is read back and compared with the
+session's keystroke log.
+Run it from the project directory:
+    python3 benchmarks/recording_bench.py
+"""
+from os.path import dirname, getsize, join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import sys
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from language_packs import LanguageRegistry  # noqa: E402
+from run_benchmarks import TYPISTS  # noqa: E402
+from session_recording import RecordingReader, RecordingWriter  # noqa: E402
+from typing_engine import TextGenerator, TypingSession  # noqa: E402
+from typists import SyntheticTypist  # noqa: E402
+
+
+def measure(directory: str, name: str, options: dict, seconds: int) -> None:
+    """Record a session of the typist and print its size and costs"""
+    words = LanguageRegistry().get("english")
+    file_name: str = join(directory, f"{name}.tsr")
+    results: list = []
+    for recorder in (None, RecordingWriter(file_name, "english", seconds, 1)):
+        session: TypingSession = TypingSession(
+            TextGenerator(words, seed=1), seconds, recorder=recorder
+        )
+        session.start(0)
+        start: float = perf_counter()
+        keys: int = SyntheticTypist(seed=1, **options).replay(session, seconds)
+        session.finish_recording(seconds * 1_000_000_000)
+        results.append((perf_counter() - start) / max(1, keys))
+    size: int = getsize(file_name)
+    start = perf_counter()
+    reader: RecordingReader = RecordingReader(file_name)
+    events: list = list(reader)
+    read: float = perf_counter() - start
+    _, expected, typed, _ = session.keystroke_log.get_columns()
+    matches: bool = [
+        ord(event.typed) if event.typed else 0 for event in events
+    ] == list(typed)
+    matches = matches and [ord(e.expected) for e in events] == list(expected)
+    reader.close()
+    print(f"{name:>10}: {keys:5} keys, {size * 60 / seconds:8.0f} bytes/min, "
+          f"{size / max(1, keys):4.2f} bytes/key, "
+          f"+{(results[1] - results[0]) * 1e6:5.2f} us/key to write, "
+          f"{read / max(1, keys) * 1e6:5.2f} us/key to read, "
+          f"{'same' if matches else 'DIFFERENT'} keys")
+    return None
+
+
+def main(seconds: int = 60) -> None:
+    """Measure every typist"""
+    with TemporaryDirectory() as directory:
+        for name, options in TYPISTS:
+            measure(directory, name, options, seconds)
+    return None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure how fast the recorded tests are scored again.
+
+Synthetic recordings (one minute of the average typist each) and their
+results are created in a temporary directory, then they are rescored with
+one worker and with one per core.
+Run it from the project directory:
+    python3 benchmarks/rescore_bench.py [recordings]
+"""
+from os import cpu_count
+from os.path import dirname, join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import sys
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from language_packs import LanguageRegistry  # noqa: E402
+from rescore import rescore  # noqa: E402
+from results_store import ResultsStore  # noqa: E402
+from run_benchmarks import TYPISTS  # noqa: E402
+from session_recording import RecordingWriter  # noqa: E402
+from typing_engine import TextGenerator, TypingSession  # noqa: E402
+from typists import SyntheticTypist  # noqa: E402
+
+
+def create_recordings(store: ResultsStore, directory: str, count: int):
+    """Record the sessions and save their results with an outdated score"""
+    words = LanguageRegistry().get("english")
+    connection = store.connect()
+    for idx in range(count):
+        recording: str = f"2000-01/{idx:016}.tsr"
+        session: TypingSession = TypingSession(
+            TextGenerator(words, seed=idx), 60, recorder=RecordingWriter(
+                join(directory, recording), "english", 60, idx, "bench"
+            )
+        )
+        session.start(0)
+        SyntheticTypist(seed=idx, **TYPISTS[1][1]).replay(session, 60)
+        session.finish_recording(60 * 1_000_000_000)
+        results: dict = session.results(60 * 1_000_000_000)
+        store.save(connection, "bench", "english", {**results, "wpm": 0},
+                   recording)
+    connection.close()
+    return None
+
+
+def main(count: int = 2000) -> None:
+    """Rescore the recordings with one worker and with every core"""
+    with TemporaryDirectory() as directory:
+        store: ResultsStore = ResultsStore(join(directory, "results.db"))
+        create_recordings(store, directory, count)
+        for workers in sorted({1, cpu_count() or 1}):
+            start: float = perf_counter()
+            scored, updated = rescore(
+                store, directory, workers, restart=True
+            )
+            elapsed: float = perf_counter() - start
+            print(f"{workers} workers: {scored} scored, {updated} updated, "
+                  f"{elapsed:.2f} s, {scored / elapsed:.0f} recordings/s")
+    return None
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,152 @@
+"""
+Replay synthetic typists against the headless typing engine.
+
+It reports the keys processed per second, the p50/p99 latency of a key,
+the text generation throughput and the memory used by a session, and can
+save everything as JSON to compare releases. Run it from the project
+directory (no display is needed):
+    python3 benchmarks/run_benchmarks.py --output bench_output.json
+"""
+from os.path import dirname, join
+from time import perf_counter, perf_counter_ns
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from language_packs import LanguageRegistry  # noqa: E402
+from typists import SyntheticTypist  # noqa: E402
+from typing_engine import TextGenerator, TypingSession  # noqa: E402
+from word_pool import WordPool  # noqa: E402
+
+TYPISTS: list = [
+    ("slow", {"wpm": 30, "error_rate": 0.08, "burstiness": 0.5}),
+    ("average", {"wpm": 60, "error_rate": 0.05, "burstiness": 0.3}),
+    ("fast", {"wpm": 120, "error_rate": 0.02, "burstiness": 0.2}),
+    ("key_repeat", {"wpm": 400, "error_rate": 0.01, "burstiness": 0.05}),
+]
+registry: LanguageRegistry = LanguageRegistry()  # Packs opened once
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Return the percentile of the already sorted values"""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def create_generator(pool: WordPool, args, seed: int) -> TextGenerator:
+    """Create a text generator with the options of the arguments"""
+    return TextGenerator(
+        words=registry.get(args.language),
+        specials=pool.get_specials() if args.specials else (),
+        numbers=pool.get_numbers() if args.numbers else (),
+        seed=seed
+    )
+
+
+def bench_typist(pool: WordPool, args, name: str, options: dict) -> dict:
+    """Replay the typist for the sessions and measure the engine"""
+    keys: int = 0
+    elapsed: float = 0.0
+    for idx in range(args.sessions):
+        session: TypingSession = TypingSession(
+            create_generator(pool, args, args.seed + idx), args.seconds
+        )
+        session.start(0)
+        typist: SyntheticTypist = SyntheticTypist(
+            seed=args.seed + idx, **options
+        )
+        start: float = perf_counter()
+        keys += typist.replay(session, args.seconds)
+        session.results()
+        elapsed += perf_counter() - start
+    # Latency of a single key, measured apart to keep the timer out of the
+    # throughput numbers
+    session = TypingSession(create_generator(pool, args, args.seed), 3600)
+    session.start(0)
+    typist = SyntheticTypist(seed=args.seed, **options)
+    latencies: list = []
+    now_ns: int = 0
+    for _ in range(args.latency_keys):
+        char, interval = typist.next_key(session.current_char())
+        now_ns += interval
+        start_ns: int = perf_counter_ns()
+        session.feed_key(char, now_ns)
+        latencies.append(perf_counter_ns() - start_ns)
+    latencies.sort()
+    return {
+        "typist": name,
+        **options,
+        "keys": keys,
+        # Includes the typist's own work, as in a real replay
+        "keys_per_second": keys / elapsed if elapsed else 0.0,
+        "p50_key_ns": percentile(latencies, 0.50),
+        "p99_key_ns": percentile(latencies, 0.99)
+    }
+
+
+def bench_text_generation(pool: WordPool, args) -> dict:
+    """Measure how many lines per second 'create_text_line' generates"""
+    generator: TextGenerator = create_generator(pool, args, args.seed)
+    start: float = perf_counter()
+    for _ in range(args.lines):
+        generator.create_text_line()
+    elapsed: float = perf_counter() - start
+    return {
+        "lines": args.lines,
+        "lines_per_second": args.lines / elapsed,
+        "mean_line_us": elapsed / args.lines * 1_000_000
+    }
+
+
+def bench_memory(pool: WordPool, args) -> dict:
+    """Measure the memory allocated by a full session of the fast typist"""
+    tracemalloc.start()
+    session: TypingSession = TypingSession(
+        create_generator(pool, args, args.seed), args.seconds
+    )
+    session.start(0)
+    SyntheticTypist(seed=args.seed, **TYPISTS[2][1]).replay(
+        session, args.seconds
+    )
+    session.results()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"session_bytes": current, "peak_bytes": peak}
+
+
+def main() -> None:
+    """Run every benchmark and print or save the report"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--seconds", type=int, default=120)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--latency-keys", type=int, default=50000)
+    parser.add_argument("--language", default="english")
+    parser.add_argument("--specials", action="store_true")
+    parser.add_argument("--numbers", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="save the report as JSON here")
+    args = parser.parse_args()
+    pool: WordPool = WordPool()
+    report: dict = {
+        "python": platform.python_version(),
+        "options": vars(args),
+        "typists": [
+            bench_typist(pool, args, name, options)
+            for name, options in TYPISTS
+        ],
+        "text_generation": bench_text_generation(pool, args),
+        "memory": bench_memory(pool, args)
+    }
+    if args.output:
+        with open(file=args.output, mode="w") as file:
+            json.dump(report, file, indent=4)
+    print(json.dumps(report, indent=4))
+    return None
+
+
+if __name__ == "__main__":
+    main()
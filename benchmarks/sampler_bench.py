@@ -0,0 +1,78 @@
+"""
+Compare the length-bucketed line filling with the old rejection loop.
+
+The old loop drew random words and, when one didn't fit, added 1 to the
+line length and tried again, so its steps depend on the corpus (and a
+corpus with a single word never ends, since repeats are always rejected).
+Run it from the project directory:
+    python3 benchmarks/sampler_bench.py
+"""
+from os.path import dirname, join
+from random import Random
+from time import perf_counter
+import sys
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from word_pool import WordPool  # noqa: E402
+from word_sampler import LengthSampler  # noqa: E402
+
+
+def legacy_fill_line(words: tuple, random: Random, max_chars: int) -> tuple:
+    """The old 'create_text_line' word loop, returns (line, steps)"""
+    line: list = []
+    line_length: int = 0
+    steps: int = 0
+    last_word = random.choice(words)
+    line.append(last_word)
+    line_length += len(last_word)
+    while line_length < max_chars:
+        steps += 1
+        word = random.choice(words)
+        if word != last_word:
+            if (line_length + len(word)) < max_chars:
+                line.append(word)
+                line_length += len(word)
+                last_word = word
+            else:
+                line_length += 1
+    return line, steps
+
+
+def measure(name: str, words: tuple, lines: int, max_chars: int) -> None:
+    """Print the time and fill of both algorithms for the corpus"""
+    random: Random = Random(1)
+    start: float = perf_counter()
+    steps: int = 0
+    legacy_chars: int = 0
+    for _ in range(lines):
+        line, line_steps = legacy_fill_line(words, random, max_chars)
+        steps += line_steps
+        legacy_chars += sum(len(word) for word in line)
+    legacy: float = perf_counter() - start
+    sampler: LengthSampler = LengthSampler(words)
+    start = perf_counter()
+    chars: int = 0
+    for _ in range(lines):
+        chars += sum(len(word) for word in sampler.fill_line(random, max_chars))
+    bucketed: float = perf_counter() - start
+    print(f"{name}:")
+    print(f"  legacy:   {legacy / lines * 1e6:8.2f} us/line, "
+          f"{steps / lines:6.1f} steps/line, {legacy_chars / lines:.1f} chars")
+    print(f"  bucketed: {bucketed / lines * 1e6:8.2f} us/line, "
+          f"{chars / lines:.1f} chars")
+    return None
+
+
+def main(lines: int = 20000, max_chars: int = 40) -> None:
+    """Measure the english corpus and a corpus of only long words"""
+    words: tuple = WordPool().get("english_words.txt")
+    measure("english", words, lines, max_chars)
+    long_words: tuple = tuple(word for word in words if len(word) >= 9)
+    measure("long words only", long_words, lines, max_chars)
+    measure("two words", ("lengthy", "tiny"), lines, max_chars)
+    return None
+
+
+if __name__ == "__main__":
+    main()
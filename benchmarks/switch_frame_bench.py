@@ -0,0 +1,56 @@
+"""
+Measure 'UI.switch_frame' latency with and without the frame cache.
+
+A cache of a single frame rebuilds the frame on every switch, as it was
+done before the cache existed. Run it from the project directory (a
+display is required by Tkinter):
+    python3 benchmarks/switch_frame_bench.py
+To compare with the code before the frame cache, run it against a checkout
+of that commit too (it has no cache, so both rows rebuild every frame):
+    git worktree add /tmp/before 7043e29~1
+    cd /tmp/before && python3 /path/to/benchmarks/switch_frame_bench.py \
+        --src src
+"""
+from os.path import abspath, dirname, join
+from time import perf_counter
+from tkinter import Tk
+import argparse
+import sys
+
+
+def measure(cache_size: int, switches: int) -> list:
+    """Bounce between MainUI and ProfileUI and return the switch times"""
+    from ui import UI  # From the source directory of the arguments
+    root: Tk = Tk()
+    ui: UI = UI(root=root)
+    root.update()  # Finish the startup (login frame)
+    ui.frame_cache_size = cache_size  # Ignored by code without the cache
+    times: list = []
+    for idx in range(switches):
+        start: float = perf_counter()
+        ui.switch_frame("MainUI" if idx % 2 == 0 else "ProfileUI")
+        times.append((perf_counter() - start) * 1000)
+    root.destroy()
+    return times[2:]  # The first switches build both frames
+
+
+def main(switches: int = 50) -> None:
+    """Print the mean and worst switch latency of both cache sizes"""
+    for label, cache_size in [("no cache", 1), ("cached", 4)]:
+        times: list = measure(cache_size, switches)
+        print(f"{label}: mean {sum(times) / len(times):.2f} ms, "
+              f"max {max(times):.2f} ms")
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--src",
+        default=join(dirname(dirname(abspath(__file__))), "src"),
+        help="source directory to measure (default: this project's)"
+    )
+    parser.add_argument("--switches", type=int, default=50)
+    args = parser.parse_args()
+    sys.path.insert(0, abspath(args.src))
+    main(args.switches)
@@ -0,0 +1,52 @@
+"""Synthetic typists that produce keystroke streams for the benchmarks."""
+from random import Random
+
+NS_PER_SECOND: int = 1_000_000_000
+
+
+class SyntheticTypist:
+    def __init__(
+            self,
+            wpm: float = 60,
+            error_rate: float = 0.05,
+            burstiness: float = 0.3,
+            seed: int = None
+    ):
+        self.wpm: float = wpm
+        self.error_rate: float = error_rate  # Chance of a wrong key
+        # Spread of the intervals between keys, 0 means a constant pace
+        self.burstiness: float = burstiness
+        self.random: Random = Random(seed)
+        self.mean_interval_ns: float = NS_PER_SECOND * 60 / (wpm * 5)
+
+    def next_key(self, expected: str) -> tuple:
+        """Return the typed key and the nanoseconds since the previous one"""
+        if self.random.random() < self.error_rate:
+            char: str = chr(self.random.randint(33, 126))
+        else:
+            char: str = expected
+        if self.burstiness <= 0:
+            return char, int(self.mean_interval_ns)
+        # Gamma intervals keep the mean pace with a burstiness spread
+        shape: float = 1 / (self.burstiness ** 2)
+        interval: float = self.random.gammavariate(
+            shape, self.mean_interval_ns / shape
+        )
+        return char, int(interval)
+
+    def replay(self, session, seconds: float) -> int:
+        """
+        Type into the session until the seconds end, feeding the synthetic
+        timestamps, and return the amount of keys typed
+        """
+        now_ns: int = session.start_ns
+        end_ns: int = now_ns + int(seconds * NS_PER_SECOND)
+        keys: int = 0
+        while True:
+            char, interval = self.next_key(session.current_char())
+            now_ns += interval
+            if now_ns >= end_ns:
+                break
+            session.feed_key(char, now_ns)
+            keys += 1
+        return keys
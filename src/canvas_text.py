@@ -0,0 +1,136 @@
+from tkinter import Canvas
+from tkinter.font import Font
+
+
+class CanvasText:
+    def __init__(
+            self,
+            canvas: Canvas,
+            font: tuple,
+            center: tuple,
+            colors: dict,
+            visible_lines: int = 4
+    ):
+        self.canvas: Canvas = canvas
+        self.font: tuple = font
+        self.center: tuple = center  # (x, y) of the whole block of lines
+        self.colors: dict = colors  # {state: color}
+        self.visible_lines: int = visible_lines
+        self.tag: str = "typing_text"
+        self.metrics: Font = Font(root=canvas, font=font)
+        self.line_step: int = 2 * self.metrics.metrics("linespace")
+        self.char_widths: dict = {}
+        self.lines: list = []  # Text of the visible lines, top to bottom
+        self.rows: list = []  # Canvas item ids of each visible line
+        self.char_idx: int = 0  # Cursor position inside the first line
+        self.pending: dict = {}  # {item: color} waiting to be drawn
+
+    def measure(self, char: str) -> int:
+        """Return the width in pixels of the character (cached)"""
+        width = self.char_widths.get(char)
+        if width is None:
+            width = self.metrics.measure(char)
+            self.char_widths[char] = width
+        return width
+
+    def get_line_y(self, row: int) -> float:
+        """Return the y coordinate of the received visible row"""
+        offset: float = row - (self.visible_lines - 1) / 2
+        return self.center[1] + offset * self.line_step
+
+    def layout_row(self, items: list, line: str, row: int) -> list:
+        """
+        Place the characters of the line in the received row, reusing the
+        received items and creating or hiding items as needed
+        """
+        widths: list = [self.measure(char) for char in line]
+        x: float = self.center[0] - sum(widths) / 2
+        y: float = self.get_line_y(row)
+        pending: str = self.colors.get("pending")
+        for idx, char in enumerate(line):
+            if idx < len(items):
+                self.pending.pop(items[idx], None)
+                self.canvas.coords(items[idx], x, y)
+                self.canvas.itemconfig(
+                    items[idx], text=char, fill=pending, state="normal"
+                )
+            else:
+                items.append(self.canvas.create_text(
+                    x, y,
+                    text=char,
+                    font=self.font,
+                    fill=pending,
+                    anchor="w",
+                    tags=(self.tag,)
+                ))
+            x += widths[idx]
+        for item in items[len(line):]:
+            self.canvas.itemconfig(item, state="hidden")
+        return items
+
+    def set_lines(self, lines: list) -> None:
+        """Clear the previous text and lay out the received lines"""
+        self.clear()
+        self.lines = list(lines[:self.visible_lines])
+        for row, line in enumerate(self.lines):
+            self.rows.append(self.layout_row([], line, row))
+        self.set_char_state(self.char_idx, "current")
+        self.render()
+        return None
+
+    def clear(self) -> None:
+        """Delete every character item and reset the cursor"""
+        self.canvas.delete(self.tag)
+        self.lines = []
+        self.rows = []
+        self.char_idx = 0
+        self.pending = {}
+        return None
+
+    def current_char(self) -> str:
+        """Return the character the user has to type next"""
+        return self.lines[0][self.char_idx]
+
+    def set_char_state(self, char_idx: int, state: str) -> None:
+        """
+        Set the color of the character of the first line according to its
+        state. It's drawn the next time 'render' is called
+        """
+        self.pending[self.rows[0][char_idx]] = self.colors.get(state)
+        return None
+
+    def render(self) -> None:
+        """Draw the characters whose state changed since the last call"""
+        for item, color in self.pending.items():
+            self.canvas.itemconfig(item, fill=color)
+        self.pending = {}
+        return None
+
+    def advance(self, correct: bool) -> bool:
+        """
+        Mark the current character and move the cursor to the next one.
+        Return True when the first line has been completed
+        """
+        state: str = "correct" if correct else "incorrect"
+        self.set_char_state(self.char_idx, state)
+        self.char_idx += 1
+        if self.char_idx >= len(self.lines[0]):
+            return True
+        self.set_char_state(self.char_idx, "current")
+        return False
+
+    def scroll(self, line: str) -> None:
+        """
+        Move every line one row up and recycle the items of the finished
+        line to show the received one at the bottom
+        """
+        finished: list = self.rows.pop(0)
+        self.lines.pop(0)
+        self.canvas.move(self.tag, 0, -self.line_step)
+        self.lines.append(line)
+        self.rows.append(
+            self.layout_row(finished, line, len(self.lines) - 1)
+        )
+        self.char_idx = 0
+        self.set_char_state(self.char_idx, "current")
+        return None
@@ -0,0 +1,171 @@
+from array import array
+from math import isfinite
+from os import replace, stat
+from struct import Struct, error as StructError
+from typing import Iterator
+import mmap
+import sys
+
+
+def scan_lines(data) -> Iterator:
+    """
+    Yield (offset, line) for every line of the bytes (or memory map),
+    skipping blank lines and the lines already seen
+    """
+    seen: set = set()
+    offset: int = 0
+    size: int = len(data)
+    while offset < size:
+        end: int = data.find(b"\n", offset)
+        if end == -1:
+            end = size
+        raw: bytes = data[offset:end].rstrip(b"\r")
+        if raw.strip() and raw not in seen:
+            seen.add(raw)
+            yield offset, raw
+        offset = end + 1
+
+
+# Header of a language pack: magic, version, byte order (1 if big endian),
+# source size, source mtime, words and bytes of the words
+PACK_HEADER: Struct = Struct("<4sHBQqII")
+PACK_MAGIC: bytes = b"TSPK"
+PACK_VERSION: int = 1
+BIG_ENDIAN: int = int(sys.byteorder == "big")
+
+
+def get_padding(size: int) -> int:
+    """Return the bytes needed after the size to align it to 8 bytes"""
+    return -size % 8
+
+
+def compile_pack(source_name: str, pack_name: str) -> int:
+    """
+    Compile a words file into a language pack and return its words. Each
+    line has a word, optionally followed by a tab and its frequency, a
+    positive number (words without it get a Zipf weight from their line,
+    as the files are ordered by frequency). The pack has the header, the
+    columns (offsets, lengths, ranks and weights) and the words, sorted by
+    length and deduplicated
+    """
+    source = stat(source_name)
+    with open(file=source_name, mode="rb") as file:
+        data: bytes = file.read()
+    entries: list = []  # [(length, rank, word)]
+    weights: array = array("d")  # Weight of every rank
+    seen: set = set()
+    for _, raw in scan_lines(data):
+        word, _, frequency = raw.partition(b"\t")
+        word = word.strip()
+        if not word or word in seen:
+            continue
+        seen.add(word)
+        rank: int = len(weights)
+        entries.append((len(word.decode("utf-8")), rank, word))
+        weight: float = (
+            float(frequency) if frequency.strip() else 1 / (rank + 1)
+        )
+        if not isfinite(weight) or weight <= 0:
+            raise ValueError(
+                f"{source_name}: the frequency of {word.decode('utf-8')!r} "
+                "must be a positive number"
+            )
+        weights.append(weight)
+    if not entries:
+        raise ValueError(f"{source_name} doesn't have any words")
+    entries.sort()
+    offsets: array = array("I", [0])  # Start of every word, and the end
+    for entry in entries:
+        offsets.append(offsets[-1] + len(entry[2]))
+    columns: tuple = (
+        offsets,
+        array("H", (entry[0] for entry in entries)),
+        array("I", (entry[1] for entry in entries)),
+        weights
+    )
+    temp_name: str = f"{pack_name}.tmp"
+    with open(file=temp_name, mode="wb") as file:
+        file.write(PACK_HEADER.pack(
+            PACK_MAGIC, PACK_VERSION, BIG_ENDIAN, source.st_size,
+            source.st_mtime_ns, len(entries), offsets[-1]
+        ))
+        file.write(bytes(get_padding(PACK_HEADER.size)))
+        for column in columns:
+            column.tofile(file)
+            file.write(bytes(get_padding(len(column) * column.itemsize)))
+        file.write(b"".join(entry[2] for entry in entries))
+    replace(temp_name, pack_name)
+    return len(entries)
+
+
+def read_pack_source(pack_name: str) -> tuple:
+    """
+    Return the (size, mtime) of the words file the pack was compiled from,
+    or None if it's missing or it isn't a pack of this version
+    """
+    try:
+        with open(file=pack_name, mode="rb") as file:
+            magic, version, big_endian, size, mtime, *_ = PACK_HEADER.unpack(
+                file.read(PACK_HEADER.size)
+            )
+    except (OSError, StructError):
+        return None
+    if (
+            magic != PACK_MAGIC or version != PACK_VERSION
+            or big_endian != BIG_ENDIAN
+    ):
+        return None
+    return size, mtime
+
+
+class PackCorpus:
+    def __init__(self, file_name: str):
+        # The pack is memory mapped and its columns are views of the map,
+        # so opening it doesn't read the words nor copy the columns
+        self.file_name: str = file_name
+        self.file = open(file=file_name, mode="rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, big_endian, size, mtime, count, _ = (
+            PACK_HEADER.unpack_from(self.map)
+        )
+        if (
+                magic != PACK_MAGIC or version != PACK_VERSION
+                or big_endian != BIG_ENDIAN
+        ):
+            self.close()
+            raise ValueError(f"{file_name} isn't a compatible language pack")
+        self.source: tuple = (size, mtime)
+        self.view: memoryview = memoryview(self.map)
+        position: int = PACK_HEADER.size + get_padding(PACK_HEADER.size)
+        self.offsets, position = self.get_column(position, "I", count + 1)
+        self.lengths, position = self.get_column(position, "H", count)
+        self.ranks, position = self.get_column(position, "I", count)
+        self.weights, position = self.get_column(position, "d", count)
+        self.words_start: int = position
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def __getitem__(self, idx: int) -> str:
+        """Return the word at the position of the length sorted words"""
+        if idx < 0:
+            idx += len(self)
+        start: int = self.words_start + self.offsets[idx]
+        end: int = self.words_start + self.offsets[idx + 1]
+        return self.map[start:end].decode("utf-8")
+
+    def get_column(self, position: int, code: str, count: int) -> tuple:
+        """Return a view of the column at the position and the next one"""
+        end: int = position + count * Struct(code).size
+        column: memoryview = self.view[position:end].cast(code)
+        return column, end + get_padding(end - position)
+
+    def close(self) -> None:
+        """Release the column views and close the memory map and the file"""
+        for name in ("offsets", "lengths", "ranks", "weights", "view"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self.map.close()
+        self.file.close()
+        return None
@@ -0,0 +1,196 @@
+from contextlib import contextmanager
+from json import JSONDecodeError, dump, dumps, load, loads
+from os import fsync, replace, stat
+import os
+from tracing import traced
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class CredentialStore:
+    def __init__(
+            self,
+            file_name: str = "src/local_users_credentials.json",
+            compact_after: int = 100
+    ):
+        # The users are saved in a snapshot (file_name) plus a journal where
+        # every new user is appended as a single JSON line
+        self.file_name: str = file_name
+        self.journal_name: str = f"{file_name}.journal"
+        self.lock_name: str = f"{file_name}.lock"
+        self.compact_after: int = compact_after  # Journal lines limit
+        self.mtime: float = None  # Modification time of the loaded snapshot
+        self.journal_offset: int = 0  # Bytes of the journal already loaded
+        self.journal_lines: int = 0
+        self.loaded: bool = False
+        self.users: dict = {}  # {username: credentials}
+        self.emails: dict = {}  # {email: username}
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.users)
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock shared with other app instances"""
+        with open(file=self.lock_name, mode="a+") as lock:
+            if os.name == "nt":
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if os.name == "nt":
+                    lock.seek(0)
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def get_mtime(file_name: str) -> float:
+        """Return the modification time of the file, or None if missing"""
+        try:
+            return stat(file_name).st_mtime
+        except FileNotFoundError:
+            return None
+
+    @traced("CredentialStore.refresh")
+    def refresh(self) -> None:
+        """
+        Load the snapshot if it wasn't loaded or if it changed, and the
+        journal lines appended since the last refresh
+        """
+        mtime: float = self.get_mtime(self.file_name)
+        if not self.loaded or mtime != self.mtime:
+            self.load()
+            self.mtime = mtime
+            self.loaded = True
+        self.load_journal()
+        return None
+
+    @traced("CredentialStore.load")
+    def load(self) -> None:
+        """Read the snapshot file and index the users"""
+        try:
+            with open(file=self.file_name, mode="r") as jsonFile:
+                data: dict = load(jsonFile)
+        except FileNotFoundError:
+            data: dict = {"users": []}
+        self.users = {}
+        self.emails = {}
+        self.journal_offset = 0
+        self.journal_lines = 0
+        for credentials in data["users"]:
+            self.index(credentials)
+        return None
+
+    @traced("CredentialStore.load_journal")
+    def load_journal(self) -> None:
+        """Index the journal lines that weren't loaded yet"""
+        try:
+            with open(file=self.journal_name, mode="rb") as journal:
+                journal.seek(0, 2)
+                if journal.tell() < self.journal_offset:
+                    # The journal was compacted by another instance
+                    self.journal_offset = 0
+                    self.journal_lines = 0
+                journal.seek(self.journal_offset)
+                for line in journal:
+                    if not line.endswith(b"\n"):
+                        break  # Partial line of an interrupted write
+                    self.journal_offset += len(line)
+                    self.journal_lines += 1
+                    try:
+                        self.index(loads(line))
+                    except JSONDecodeError as e:
+                        print(e)
+        except FileNotFoundError:
+            self.journal_offset = 0
+            self.journal_lines = 0
+        return None
+
+    def index(self, credentials: dict) -> None:
+        """Add the credentials to the username and email indexes"""
+        self.users[credentials["username"]] = credentials
+        self.emails[credentials["email"]] = credentials["username"]
+        return None
+
+    def get_user(self, username: str) -> dict:
+        """Return the credentials of the username, or None if not found"""
+        self.refresh()
+        return self.users.get(username)
+
+    def get_username(self, email: str) -> str:
+        """Return the username registered with the email, or None"""
+        self.refresh()
+        return self.emails.get(email)
+
+    def add_user(self, email: str, username: str, password: str) -> None:
+        """
+        Append the credentials of a new user (the password already hashed)
+        to the journal. Raise ValueError if the username already exists
+        """
+        credentials: dict = {
+            "email": email, "username": username, "password": password
+        }
+        with self.locked():
+            self.refresh()
+            if username in self.users:
+                raise ValueError("The username already exists")
+            self.append(credentials)
+        return None
+
+    def update_password(self, username: str, password: str) -> None:
+        """
+        Replace the password (already hashed) of an existing user.
+        Raise ValueError if the username doesn't exist
+        """
+        with self.locked():
+            self.refresh()
+            credentials = self.users.get(username)
+            if credentials is None:
+                raise ValueError("The username does not exist")
+            self.append({**credentials, "password": password})
+        return None
+
+    @traced("CredentialStore.append")
+    def append(self, credentials: dict) -> None:
+        """
+        Append the credentials to the journal, the last line of a username
+        replaces the previous ones. Must be called holding the lock
+        """
+        with open(file=self.journal_name, mode="ab") as journal:
+            # Drop the partial line left by an interrupted write
+            journal.truncate(self.journal_offset)
+            journal.write(dumps(credentials).encode("utf-8") + b"\n")
+            journal.flush()
+            fsync(journal.fileno())
+        self.load_journal()
+        if self.journal_lines >= self.compact_after:
+            self.compact()
+        return None
+
+    @traced("CredentialStore.compact")
+    def compact(self) -> None:
+        """
+        Merge the journal into the snapshot, which is replaced atomically.
+        Must be called holding the lock
+        """
+        temp_name: str = f"{self.file_name}.tmp"
+        with open(file=temp_name, mode="w") as json:
+            dump({"users": list(self.users.values())}, json, indent=4)
+            json.flush()
+            fsync(json.fileno())
+        replace(temp_name, self.file_name)
+        # If it stops here, the journal users are loaded twice with no harm
+        with open(file=self.journal_name, mode="wb"):
+            pass
+        self.mtime = self.get_mtime(self.file_name)
+        self.journal_offset = 0
+        self.journal_lines = 0
+        return None
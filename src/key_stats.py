@@ -0,0 +1,212 @@
+from array import array
+from struct import Struct
+import sys
+import zlib
+
+SLOTS: int = 256  # Latin-1 code points, the other characters share slot 0
+MAX_LATENCY_NS: int = 2_000_000_000  # Longer intervals are pauses
+# Header of the saved stats: magic, version, slots, byte order (1 if big)
+STATS_HEADER: Struct = Struct("<4sHHB")
+STATS_MAGIC: bytes = b"TSKS"
+STATS_VERSION: int = 1
+BIG_ENDIAN: int = int(sys.byteorder == "big")
+
+
+def get_slot(code: int) -> int:
+    """Return the slot of the character code"""
+    return code if code < SLOTS else 0
+
+
+class RunningStats:
+    def __init__(self, size: int):
+        # Columns of every slot: keys, wrong keys and the latency samples
+        # with their mean and sum of squared differences (Welford)
+        self.count: array = array("I", [0]) * size
+        self.errors: array = array("I", [0]) * size
+        self.samples: array = array("I", [0]) * size
+        self.mean: array = array("d", [0.0]) * size  # Milliseconds
+        self.m2: array = array("d", [0.0]) * size
+        self.used: set = set()  # Slots with at least one key
+
+    def get_columns(self) -> tuple:
+        """Return the columns in the order they are saved"""
+        return self.count, self.errors, self.samples, self.mean, self.m2
+
+    def add(self, idx: int, correct: bool, latency_ms: float = None) -> None:
+        """Add a key to the slot, with its latency if it has one"""
+        self.count[idx] += 1
+        self.errors[idx] += not correct
+        self.used.add(idx)
+        if latency_ms is not None:
+            samples: int = self.samples[idx] + 1
+            delta: float = latency_ms - self.mean[idx]
+            self.samples[idx] = samples
+            self.mean[idx] += delta / samples
+            self.m2[idx] += delta * (latency_ms - self.mean[idx])
+        return None
+
+    def merge(self, other: "RunningStats") -> None:
+        """
+        Add the stats of the other table, slot by slot, as if their keys
+        were added here (Chan's parallel variance)
+        """
+        for idx in other.used:
+            self.count[idx] += other.count[idx]
+            self.errors[idx] += other.errors[idx]
+            self.used.add(idx)
+            other_samples: int = other.samples[idx]
+            if not other_samples:
+                continue
+            samples: int = self.samples[idx] + other_samples
+            delta: float = other.mean[idx] - self.mean[idx]
+            self.m2[idx] += other.m2[idx] + (
+                delta * delta * self.samples[idx] * other_samples / samples
+            )
+            self.mean[idx] += delta * other_samples / samples
+            self.samples[idx] = samples
+        return None
+
+    def get_variance(self, idx: int) -> float:
+        """Return the sample variance of the slot's latency"""
+        if self.samples[idx] < 2:
+            return 0.0
+        return self.m2[idx] / (self.samples[idx] - 1)
+
+    def get_error_rate(self, idx: int) -> float:
+        """Return the wrong keys of the slot, from 0 to 1"""
+        return self.errors[idx] / self.count[idx] if self.count[idx] else 0.0
+
+
+class KeyStats:
+    def __init__(self):
+        # A slot for each character and one for each pair of characters
+        # (the previous and the current one), indexed by their codes
+        self.keys: RunningStats = RunningStats(SLOTS)
+        self.bigrams: RunningStats = RunningStats(SLOTS * SLOTS)
+
+    def add_session(self, timestamps, expected, correct) -> None:
+        """
+        Add the keys of a session from the keystroke log columns: the
+        latency of a key is the time since the previous one, and the
+        bigram is the previous expected character and its own
+        """
+        previous: int = -1
+        last_ns: int = 0
+        for timestamp, code, is_correct in zip(timestamps, expected, correct):
+            slot: int = get_slot(code)
+            latency_ns: int = timestamp - last_ns
+            latency_ms = None
+            if previous >= 0 and latency_ns <= MAX_LATENCY_NS:
+                latency_ms = latency_ns / 1_000_000
+            self.keys.add(slot, is_correct, latency_ms)
+            if previous >= 0:
+                bigram: int = previous * SLOTS + slot
+                self.bigrams.add(bigram, is_correct, latency_ms)
+            previous = slot
+            last_ns = timestamp
+        return None
+
+    def merge(self, other: "KeyStats") -> None:
+        """Add the stats of the other keys (e.g. a finished session)"""
+        self.keys.merge(other.keys)
+        self.bigrams.merge(other.bigrams)
+        return None
+
+    def get_combined(self, chars: str) -> tuple:
+        """
+        Return the (keys, error rate, mean latency) of the characters
+        together, e.g. a letter and its upper case. Characters sharing a
+        slot (e.g. a digit and its upper case) are only counted once
+        """
+        count: int = 0
+        errors: int = 0
+        samples: int = 0
+        mean: float = 0.0
+        for slot in dict.fromkeys(get_slot(ord(char)) for char in chars):
+            count += self.keys.count[slot]
+            errors += self.keys.errors[slot]
+            slot_samples: int = self.keys.samples[slot]
+            if slot_samples:
+                samples += slot_samples
+                mean += (self.keys.mean[slot] - mean) * slot_samples / samples
+        return count, errors / count if count else 0.0, mean
+
+    def get_slowest_bigrams(
+            self, limit: int = 5, min_samples: int = 5
+    ) -> list:
+        """
+        Return the bigrams with the highest mean latency and enough
+        samples as (bigram, mean latency, error rate), slowest first
+        """
+        bigrams: RunningStats = self.bigrams
+        candidates: list = sorted(
+            (idx for idx in bigrams.used
+             if bigrams.samples[idx] >= min_samples and idx % SLOTS),
+            key=lambda idx: bigrams.mean[idx],
+            reverse=True
+        )
+        return [
+            (chr(idx // SLOTS) + chr(idx % SLOTS), bigrams.mean[idx],
+             bigrams.get_error_rate(idx))
+            for idx in candidates[:limit]
+        ]
+
+    def get_weak_bigrams(
+            self, limit: int = 10, min_samples: int = 5
+    ) -> list:
+        """
+        Return the bigrams inside words (no spaces) with enough samples
+        that are weaker than the average one, as (bigram slot, score)
+        pairs, weakest first. A bigram is weighed by its mean latency,
+        doubled by every error in two keys, and its score is how much it
+        exceeds the average weight
+        """
+        bigrams: RunningStats = self.bigrams
+        scores: list = []
+        for idx in bigrams.used:
+            first, second = divmod(idx, SLOTS)
+            if (
+                    bigrams.samples[idx] < min_samples
+                    or not first or not second
+                    or chr(first).isspace() or chr(second).isspace()
+            ):
+                continue
+            weight: float = bigrams.mean[idx] * (
+                1 + 2 * bigrams.get_error_rate(idx)
+            )
+            scores.append((idx, weight))
+        if not scores:
+            return []
+        average: float = sum(weight for _, weight in scores) / len(scores)
+        scores = [
+            (idx, weight - average) for idx, weight in scores
+            if weight > average
+        ]
+        scores.sort(key=lambda pair: pair[1], reverse=True)
+        return scores[:limit]
+
+    def to_bytes(self) -> bytes:
+        """Return the stats compressed (most slots are empty)"""
+        columns: tuple = self.keys.get_columns() + self.bigrams.get_columns()
+        return STATS_HEADER.pack(
+            STATS_MAGIC, STATS_VERSION, SLOTS, BIG_ENDIAN
+        ) + zlib.compress(b"".join(column.tobytes() for column in columns))
+
+    def load(self, data: bytes) -> None:
+        """Replace the stats with the saved ones (see 'to_bytes')"""
+        magic, version, slots, big_endian = STATS_HEADER.unpack_from(data)
+        if magic != STATS_MAGIC or version != STATS_VERSION or slots != SLOTS:
+            raise ValueError("The saved key stats aren't compatible")
+        raw: bytes = zlib.decompress(data[STATS_HEADER.size:])
+        position: int = 0
+        for table in (self.keys, self.bigrams):
+            for column in table.get_columns():
+                end: int = position + len(column) * column.itemsize
+                column[:] = array(column.typecode, raw[position:end])
+                if big_endian != BIG_ENDIAN:
+                    column.byteswap()
+                position = end
+            table.used = {
+                idx for idx, count in enumerate(table.count) if count
+            }
+        return None
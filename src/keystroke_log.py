@@ -0,0 +1,57 @@
+from array import array
+
+
+class KeystrokeLog:
+    def __init__(self, capacity: int = 6000):
+        # 6000 keys are 50 keys per second during the longest test (120s)
+        self.capacity: int = capacity
+        self.timestamps: array = array("q", [0]) * capacity  # perf_counter_ns
+        self.expected: array = array("I", [0]) * capacity  # Code points
+        self.typed: array = array("I", [0]) * capacity  # Code points
+        self.correct: array = array("b", [0]) * capacity
+        self.next_idx: int = 0  # Position where the next key is written
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(
+            self, timestamp: int, expected: str, typed: str, correct: bool
+    ) -> None:
+        """
+        Save a processed key, overwriting the oldest one when it's full.
+        An empty typed character (e.g. dead keys) is saved as 0
+        """
+        idx: int = self.next_idx
+        self.timestamps[idx] = timestamp
+        self.expected[idx] = ord(expected)
+        self.typed[idx] = ord(typed[0]) if typed else 0
+        self.correct[idx] = correct
+        self.next_idx = idx + 1 if idx + 1 < self.capacity else 0
+        if self.size < self.capacity:
+            self.size += 1
+        return None
+
+    def clear(self) -> None:
+        """Forget every saved key, keeping the allocated memory"""
+        self.next_idx = 0
+        self.size = 0
+        return None
+
+    def ordered(self, column: array) -> array:
+        """Return a copy of the column with the keys in the typed order"""
+        if self.size < self.capacity:
+            return column[:self.size]
+        return column[self.next_idx:] + column[:self.next_idx]
+
+    def get_columns(self) -> tuple:
+        """
+        Return the saved keys as arrays in the typed order:
+        (timestamps, expected, typed, correct)
+        """
+        return (
+            self.ordered(self.timestamps),
+            self.ordered(self.expected),
+            self.ordered(self.typed),
+            self.ordered(self.correct)
+        )
@@ -0,0 +1,125 @@
+from os import listdir, makedirs, stat
+from os.path import join
+from threading import Lock
+from corpus import PackCorpus, compile_pack, read_pack_source
+from word_pool import FILES_DIRECTORY
+
+SOURCE_SUFFIX: str = "_words.txt"  # A language pack is <language>_words.txt
+PACK_SUFFIX: str = ".pack"
+
+
+class LanguageRegistry:
+    def __init__(
+            self, directory: str = FILES_DIRECTORY, packs_directory: str = None
+    ):
+        self.directory: str = directory  # Words files of the languages
+        # Compiled packs, built from the words files when they change
+        self.packs_directory: str = packs_directory or join(directory, "packs")
+        self.languages: list = []  # Found by 'discover', sorted by name
+        self.packs: dict = {}  # {language: PackCorpus}, opened on first use
+        self.lock: Lock = Lock()  # Packs are compiled from other threads
+        self.discover()
+
+    def discover(self) -> list:
+        """
+        Find the languages of the words files in the directory, skipping
+        the files without words
+        """
+        try:
+            names: list = listdir(self.directory)
+        except FileNotFoundError as e:
+            print(e)
+            names = []
+        self.languages = sorted(
+            language for language in (
+                name[:-len(SOURCE_SUFFIX)] for name in names
+                if name.endswith(SOURCE_SUFFIX)
+                and len(name) > len(SOURCE_SUFFIX)
+            )
+            if self.has_words(language)
+        )
+        return self.languages
+
+    def has_words(self, language: str) -> bool:
+        """
+        Return if the words file of the language has a word, reading it
+        only up to the first one
+        """
+        try:
+            with open(file=self.get_source_path(language), mode="rb") as file:
+                return any(
+                    line.partition(b"\t")[0].strip() for line in file
+                )
+        except OSError as e:
+            print(e)
+            return False
+
+    def get_source_path(self, language: str) -> str:
+        """Return the path of the words file of the language"""
+        return join(self.directory, f"{language}{SOURCE_SUFFIX}")
+
+    def get_pack_path(self, language: str) -> str:
+        """Return the path of the compiled pack of the language"""
+        return join(self.packs_directory, f"{language}{PACK_SUFFIX}")
+
+    def get_source(self, language: str) -> tuple:
+        """Return the (size, mtime) of the words file of the language"""
+        source = stat(self.get_source_path(language))
+        return source.st_size, source.st_mtime_ns
+
+    def is_compiled(self, language: str) -> bool:
+        """Return if the pack exists and matches the words file"""
+        return (
+            read_pack_source(self.get_pack_path(language))
+            == self.get_source(language)
+        )
+
+    def compile(self, language: str, force: bool = False) -> bool:
+        """
+        Compile the words file of the language if its pack is missing or
+        outdated (or if forced), return if it was compiled
+        """
+        if not force and self.is_compiled(language):
+            return False
+        makedirs(self.packs_directory, exist_ok=True)
+        compile_pack(
+            self.get_source_path(language), self.get_pack_path(language)
+        )
+        return True
+
+    def compile_all(self, force: bool = False) -> list:
+        """
+        Compile the packs of every language, return the compiled ones (the
+        broken words files are reported and skipped)
+        """
+        compiled: list = []
+        with self.lock:
+            for language in self.discover():
+                try:
+                    if self.compile(language, force):
+                        compiled.append(language)
+                except (OSError, ValueError) as e:
+                    print(e)
+        return compiled
+
+    def get(self, language: str) -> PackCorpus:
+        """
+        Return the pack of the language, opening it only the first time or
+        after its words file changes (compiling it first if needed)
+        """
+        with self.lock:
+            pack = self.packs.get(language)
+            if pack is not None and pack.source == self.get_source(language):
+                return pack
+            self.compile(language)
+            # The old pack isn't closed, sessions may still be reading it
+            pack = PackCorpus(self.get_pack_path(language))
+            self.packs[language] = pack
+            return pack
+
+    def get_opened(self, language: str) -> PackCorpus:
+        """
+        Return the pack of the language if it's already open, without
+        checking its words file nor waiting for a compilation (see 'get')
+        """
+        return self.packs.get(language)
@@ -1,7 +1,5 @@
-from tkinter import Frame, Tk, Button, Entry, Label, Event, END, messagebox
-from hashlib import sha256
+from tkinter import Frame, Tk, Button, Entry, Label, Event, END
 from typing import cast
-from json import load
 
 
 class LoginUI(Frame):
@@ -14,6 +12,7 @@ class LoginUI(Frame):
             ("<Return>", self.check_login_form),
         ]
         self.binds_id: list = []
+        self.checking: bool = False  # The password is being verified
         self.configure_layout()
         self.create_form()
 
@@ -32,10 +31,11 @@ class LoginUI(Frame):
         return None
 
     def on_frame_deactivation(self) -> None:
-        """Unset the frame's key bindings and clear the list"""
+        """Unset the frame's key bindings, clear the list and the form"""
         for seq, bId in self.binds_id:
             self.master.unbind(seq, bId)
         self.binds_id = []
+        self.clear_form()
         return None
 
     def create_form(self) -> None:
@@ -115,26 +115,25 @@ class LoginUI(Frame):
 
     def check_login_form(self, event: Event = None) -> None:
         """Check the form inputs to validate the credentials"""
+        from tkinter import messagebox  # Imported when it's first needed
         user: str = self.input_username.get()
         password: str = self.input_password.get()
+        if self.checking:
+            return None
         if len(user) == 0 or len(password) == 0:
             messagebox.showerror(
                 title="Error logging in",
                 message="Don't leave blank inputs. Try again!"
             )
             return None
-        data: dict = self.get_all_credentials()
-        if len(data["users"]) == 0:
+        store = self.ui.credential_store
+        if len(store) == 0:
             messagebox.showerror(
                 title="Missing data",
                 message="There are not any credentials saved. Try registering!"
             )
             return None
-        credentials = None
-        for info in data["users"]:
-            if info["username"] == user:
-                credentials = info
-                break
+        credentials: dict = store.get_user(user)
         if credentials is None:
             messagebox.showerror(
                 title="Incorrect credentials",
@@ -142,37 +141,58 @@ class LoginUI(Frame):
             )
             self.clear_form()
             return None
-        hashedPass = self.hash_password(password)
-        if credentials["password"] != hashedPass:
+        self.checking = True
+        self.ui.password_hasher.verify_async(
+            password,
+            credentials["password"],
+            lambda result: self.finish_login(user, password, *result),
+            self.fail_login
+        )
+        return None
+
+    def fail_login(self, error: BaseException) -> None:
+        """Show why the password couldn't be verified (e.g. a broken hash)"""
+        from tkinter import messagebox
+        self.checking = False
+        print(error)
+        messagebox.showerror(
+            title="Error logging in",
+            message=f"The password couldn't be checked: {error}"
+        )
+        return None
+
+    def finish_login(
+            self,
+            user: str,
+            password: str,
+            is_valid: bool,
+            needs_rehash: bool
+    ) -> None:
+        """Log in the user once the password has been verified"""
+        from tkinter import messagebox
+        self.checking = False
+        if not is_valid:
             messagebox.showerror(
                 title="Incorrect credentials",
                 message="The introduced password is incorrect. Check again!"
             )
             return None
+        if needs_rehash:
+            # Old or weaker hashes are replaced now that the password is known
+            self.ui.password_hasher.hash_async(
+                password,
+                lambda hashed: self.ui.credential_store.update_password(
+                    user, hashed
+                )
+            )
         messagebox.showinfo(
             title="Successful login",
             message="The introduced credentials are valid!"
         )
+        self.ui.username = user
         self.switch_to_main()
         return None
 
-    @staticmethod
-    def get_all_credentials() -> dict:
-        """Get all the credentials saved in the json file"""
-        file_name: str = "src/local_users_credentials.json"
-        try:
-            with open(file=file_name, mode="r") as jsonFile:
-                data: dict = load(jsonFile)
-        except FileNotFoundError as e:
-            print(e)
-            data: dict = {"users": []}
-        return data
-
-    @staticmethod
-    def hash_password(password: str) -> str:
-        """Return the received password as a SHA256 hash"""
-        return sha256(password.encode("utf-8")).hexdigest()
-
     def clear_form(self) -> None:
         """Clear the form inputs"""
         self.input_username.delete(0, END)
@@ -1,6 +1,45 @@
-from tkinter import Tk
-from ui import UI
+from time import perf_counter
+import argparse
 
-rt = Tk()
-ui_obj = UI(root=rt)
-ui_obj.keep_open()
+
+def main() -> None:
+    """Parse the arguments, build the interface and keep it open"""
+    started: float = perf_counter()
+    parser = argparse.ArgumentParser(description="Typing Speed")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print the time taken by every startup stage"
+    )
+    parser.add_argument(
+        "--compile-packs",
+        action="store_true",
+        help="compile the language packs that changed and exit"
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="trace.json",
+        metavar="FILE",
+        help="record tracing spans and write them to FILE on exit "
+             "(Chrome trace event format, default: trace.json)"
+    )
+    args = parser.parse_args()
+    if args.trace:
+        import tracing  # Before the traced modules are imported
+        tracing.enable(args.trace)
+    if args.compile_packs:
+        from language_packs import LanguageRegistry
+        compiled: list = LanguageRegistry().compile_all()
+        print(f"Compiled: {', '.join(compiled) or 'nothing, all up to date'}")
+        return None
+    from tkinter import Tk  # Imported here to be measured in the startup
+    from ui import UI
+    rt = Tk()
+    ui_obj = UI(root=rt, started=started, profile=args.profile_startup)
+    ui_obj.keep_open()
+    return None
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
 from tkinter import Frame, Tk, Canvas, Label, Button
 from tkinter import Event, OptionMenu, StringVar
-from threading import Thread
-from random import choice, randint
 from typing import cast
-from math import floor
-import time
+from threading import Thread
+from math import ceil
+from random import getrandbits
+from test_clock import TestClock
+from tracing import traced
+from canvas_text import CanvasText
+from corpus import PackCorpus
+from render_scheduler import RenderScheduler
+from session_recording import RecordingWriter, get_recording_name
+from session_recording import get_recording_path
+from session_recording import ADAPTIVE, FREQUENCY_WORDS, NUMBERS, SPECIALS
+from typing_engine import TextGenerator, TypingSession
+from word_sampler import AdaptiveSampler, get_bigram_index
+from word_sampler import get_sampler, get_weighted_sampler
+from word_sampler import find_bigram_index, prepare_samplers
 
 
 class MainUI(Frame):
@@ -12,11 +23,8 @@ class MainUI(Frame):
         super().__init__(master)
         self.ui = ui
         self.canvas: Canvas = cast(Canvas, None)
-        self.canvas_text_id: int = 0
-        self.canvas_text: str = ""
-        self.canvas_text_idx: int = 0
+        self.text_engine: CanvasText = cast(CanvasText, None)
         self.canvas_guide_id: int = 0
-        self.canvas_guide_idx: int = 1  # Represents the line user is currently
         self.max_chars: dict = {  # Should be dinamically calculated
             "canvas": 40,
             "specials": 2,
@@ -24,34 +32,44 @@ class MainUI(Frame):
         }
         self.text_correct: Label = cast(Label, None)
         self.text_incorrect: Label = cast(Label, None)
-        self.text_counter: list = [0, 0]  # [correct, incorrect]
+        self.session: TypingSession = cast(TypingSession, None)
+        self.prefetch_id = None
         self.text_timer: Label = cast(Label, None)
         self.seconds: int = 0
         self.numbers: bool = False
         self.specials: bool = False
+        self.adaptive: bool = False  # Target the user's weak bigrams
+        self.frequency_words: bool = True  # Common words appear more often
+        self.record_sessions: bool = True  # Archive every test's keys
         self.test_on: bool = False
         self.timer_on: bool = False
+        self.timer_shown: int = 0
+        self.clock: TestClock = TestClock(
+            self, self.update_timer, self.end_timer
+        )
         self.bindings: list = [
             ("<Return>", self.start_typing_test),
             ("<Escape>", self.finish_typing_test),
             ("<KeyPress>", self.check_typing),
         ]
-        self.no_keys: list = [
+        self.no_keys: frozenset = frozenset({
             "Return", "Escape", "Shift_L", "Shift_R", "Alt_L",
             "Alt_R", "Caps_Lock", "Control_L", "Control_R",
             "Delete", "Tab", "BackSpace", "Meta_L", "Meta_R",
-        ]
+        })
+        self.renderer: RenderScheduler = RenderScheduler(
+            self, self.ui.frame_budget_ms
+        )
+        self.shown_counter: list = [0, 0]  # Values shown in the labels
         self.bind_ids: list = []
-        self.words: list = []
-        self.specials: list = []
-        self.numbers: list = []
         self.language: StringVar = StringVar(self)
-        self.language.set("english")
-        self.languages: list = ["english", "spanish"]
+        self.language.set(self.ui.default_language)
+        self.languages: list = self.ui.language_packs.languages
         self.configure_layout()
         self.create_top_bar()
         self.create_canvas()
         self.create_bottom_bar()
+        self.register_renderers()
         self.set_time_variable(30)
 
     def configure_layout(self) -> None:
@@ -84,8 +102,8 @@ class MainUI(Frame):
             relief="flat",
             bd=1
         )
-        top_bar.grid(row=0, column=0, columnspan=10, sticky="ew", pady=20)
-        top_bar.grid_columnconfigure(tuple(range(9)), weight=1)
+        top_bar.grid(row=0, column=0, columnspan=12, sticky="ew", pady=20)
+        top_bar.grid_columnconfigure(tuple(range(12)), weight=1)
         btn_styles: dict = {
             "bg": self.ui.styles.get("background_color"),
             "fg": self.ui.styles.get("button_font_color"),
@@ -101,7 +119,8 @@ class MainUI(Frame):
             ("30s", self.set_time_variable, 0, 30),
             ("60s", self.set_time_variable, 1, 60),
             ("90s", self.set_time_variable, 2, 90),
-            ("120s", self.set_time_variable, 3, 120)
+            ("120s", self.set_time_variable, 3, 120),
+            ("Endless", self.set_time_variable, 4, 0)
         ]
         for text, command, col, secs in time_btn_config:
             btn: Button = Button(
@@ -117,12 +136,13 @@ class MainUI(Frame):
             bg=self.ui.styles.get("background_color"),
             width=2
         )
-        sep1.grid(row=0, column=4, sticky="ns", padx=5)
+        sep1.grid(row=0, column=5, sticky="ns", padx=5)
         setattr(self, "separator1", sep1)
         option_menu: OptionMenu = OptionMenu(
             top_bar,
             self.language,
-            *self.languages
+            *(self.languages or [self.language.get()]),
+            command=self.set_language_variable
         )
         option_menu.config(
             bg=self.ui.styles.get("background_color"),
@@ -138,11 +158,12 @@ class MainUI(Frame):
             activebackground=self.ui.styles.get("button_active_color"),
             activeforeground="white", bd=2
         )
-        option_menu.grid(row=0, column=5, sticky="nsew", padx=2, pady=2)
+        option_menu.grid(row=0, column=6, sticky="nsew", padx=2, pady=2)
         setattr(self, "option_menu", option_menu)
         extra_btn_config: list = [
-            ("Specials", self.set_specials_variable, 6),
-            ("Numbers", self.set_numbers_variable, 7)
+            ("Specials", self.set_specials_variable, 7),
+            ("Numbers", self.set_numbers_variable, 8),
+            ("Adaptive", self.set_adaptive_variable, 9)
         ]
         for text, command, col in extra_btn_config:
             btn: Button = Button(
@@ -158,7 +179,7 @@ class MainUI(Frame):
             bg=self.ui.styles.get("background_color"),
             width=2
         )
-        sep2.grid(row=0, column=8, sticky="ns", padx=5)
+        sep2.grid(row=0, column=10, sticky="ns", padx=5)
         setattr(self, "separator2", sep2)
         profile: Button = Button(
             top_bar,
@@ -166,7 +187,7 @@ class MainUI(Frame):
             command=self.switch_to_profile,
             **btn_styles
         )
-        profile.grid(row=0, column=9, sticky="nsew", padx=2, pady=2)
+        profile.grid(row=0, column=11, sticky="nsew", padx=2, pady=2)
         setattr(self, "btnProfile", profile)
         return None
 
@@ -188,6 +209,17 @@ class MainUI(Frame):
             highlightthickness=0
         )
         self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.text_engine: CanvasText = CanvasText(
+            self.canvas,
+            font=self.ui.styles.get("canvas_label_font"),
+            center=(700, 370),  # Should be dinamically calculated
+            colors={
+                "pending": self.ui.styles.get("label_font_color"),
+                "current": self.ui.styles.get("guide_font_color"),
+                "correct": "#27ae60",
+                "incorrect": "#c0392b"
+            }
+        )
         return None
 
     def create_bottom_bar(self) -> None:
@@ -209,7 +241,7 @@ class MainUI(Frame):
         }
         self.text_correct: Label = Label(
             status_bar,
-            text=f"Correct: {self.text_counter[0]}",
+            text="Correct: 0",
             fg="#27ae60",
             anchor="w",
             **metric_styles
@@ -224,7 +256,7 @@ class MainUI(Frame):
         self.text_timer.grid(row=0, column=3, columnspan=3, sticky="ns")
         self.text_incorrect: Label = Label(
             status_bar,
-            text=f"Incorrect: {self.text_counter[1]}",
+            text="Incorrect: 0",
             fg="#c0392b",
             anchor="e",
             **metric_styles
@@ -232,6 +264,19 @@ class MainUI(Frame):
         self.text_incorrect.grid(row=0, column=6, columnspan=3, sticky="e")
         return None
 
+    def register_renderers(self) -> None:
+        """Register the fields redrawn once per frame by the scheduler"""
+        self.renderer.register(
+            "correct", lambda: self.update_text_counter(0)
+        )
+        self.renderer.register(
+            "incorrect", lambda: self.update_text_counter(1)
+        )
+        self.renderer.register("timer", self.update_timer_text)
+        self.renderer.register("cursor", self.text_engine.render)
+        self.renderer.register("guide", self.update_guide)
+        return None
+
     def switch_to_profile(self) -> None:
         """Switch to profile frame from the main frame"""
         if not self.test_on:
@@ -239,12 +284,38 @@ class MainUI(Frame):
         return None
 
     def set_time_variable(self, seconds: int) -> None:
-        """Change the time used for the tests"""
+        """Change the time used for the tests, 0 means an endless test"""
         if not self.test_on:
             self.seconds = seconds
-            self.text_timer.config(text=f"Time: {self.seconds}s")
+            self.text_timer.config(text=self.get_time_text(self.seconds))
+        return None
+
+    def set_language_variable(self, language: str) -> None:
+        """Open the chosen language pack in a background thread"""
+        Thread(
+            target=self.load_language, args=(language,), daemon=True
+        ).start()
+        return None
+
+    def load_language(self, language: str) -> None:
+        """
+        Compile (if needed) and open the language pack and its samplers,
+        and its bigram index too if the adaptive option is enabled
+        """
+        try:
+            words: PackCorpus = self.ui.language_packs.get(language)
+            prepare_samplers(words)
+            if self.adaptive:
+                get_bigram_index(words)
+        except (OSError, ValueError) as e:
+            print(e)
         return None
 
+    @staticmethod
+    def get_time_text(seconds: int) -> str:
+        """Return the timer text of the seconds (0 for an endless test)"""
+        return f"Time: {seconds}s" if seconds else "Time: endless"
+
     def set_numbers_variable(self) -> None:
         """Change the numbers variable to enable or disable them"""
         if not self.test_on:
@@ -257,43 +328,80 @@ class MainUI(Frame):
             self.specials = not self.specials
         return None
 
+    def set_adaptive_variable(self) -> None:
+        """
+        Change the adaptive variable to enable or disable it, building the
+        bigram index of the language in the background when enabled
+        """
+        if not self.test_on:
+            self.adaptive = not self.adaptive
+            if self.adaptive:
+                Thread(target=self.load_bigram_index, daemon=True).start()
+        return None
+
+    def load_bigram_index(self) -> None:
+        """Build the bigram index of the current language (if missing)"""
+        try:
+            get_bigram_index(self.ui.language_packs.get(self.language.get()))
+        except (OSError, ValueError) as e:
+            print(e)
+        return None
+
     def start_timer(self) -> None:
         """Start the timer for the typing test"""
         self.timer_on = True
+        self.timer_shown = self.seconds
+        if self.seconds:
+            self.clock.start(self.seconds)
+        return None
 
-        def countdown() -> None:
-            time_left: int = self.seconds
-            while time_left > 0 and self.timer_on:
-                time.sleep(1)
-                time_left -= 1
-                self.text_timer.config(text=f"Time: {time_left}s")
-            if time_left <= 0:
-                self.timer_on = False
-                self.show_test_results()
-            return None
+    def update_timer(self, time_left: float) -> None:
+        """Update the timer text only when the shown second changes"""
+        seconds: int = ceil(time_left)
+        if seconds != self.timer_shown:
+            self.timer_shown = seconds
+            self.renderer.mark("timer")
+        return None
+
+    def update_timer_text(self) -> None:
+        """Update the timer text with the last shown second"""
+        self.text_timer.config(text=self.get_time_text(self.timer_shown))
+        return None
 
-        timer_thread: Thread = Thread(target=countdown)
-        timer_thread.daemon = True
-        timer_thread.start()
+    def end_timer(self) -> None:
+        """Finish the timer and show the typing test results"""
+        self.timer_on = False
+        self.session.finished = True
+        self.renderer.flush_now()
+        self.show_test_results()
         return None
 
     def start_typing_test(self, event: Event) -> None:
         """Start the typing test setting variables and calling functions"""
         if not self.test_on and not self.timer_on:
+            try:
+                session: TypingSession = self.create_session()
+            except (OSError, ValueError) as e:
+                print(e)  # e.g. a language without words
+                return None
             print(f"Test started using {event.keysym} key.")
             self.test_on = True
-            self.fill_words_list()
-            if self.specials:
-                self.fill_specials_list()
-            if self.numbers:
-                self.fill_numbers_list()
+            self.session = session
+            self.session.start()
             self.start_timer()
             self.typing_test_text()
+            if self.session.recorder is not None:
+                self.after_idle(self.session.recorder.open)  # After drawing
         return None
 
     def finish_typing_test(self, event: Event) -> None:
-        """Finish the typing test if it started and timer has ended"""
-        if self.test_on and not self.timer_on:
+        """
+        Finish the typing test if it started and timer has ended. An
+        endless test is ended here, showing its results first
+        """
+        if self.test_on and self.timer_on and not self.seconds:
+            self.end_timer()
+        elif self.test_on and not self.timer_on:
             print(f"Typing test finished using {event.keysym} key.")
             self.test_on = False
             self.clear_test()
@@ -302,140 +410,102 @@ class MainUI(Frame):
     def clear_test(self) -> None:
         """Clear and set configurations to the initial ones"""
         self.clear_canvas()
+        self.clock.stop()
+        self.renderer.cancel()
+        self.cancel_prefetch()
         self.timer_on = False
         self.test_on = False
-        self.text_counter = [0, 0]
-        self.words = []
-        self.specials = []
-        self.numbers = []
-        self.text_timer.config(text=f"Time: {self.seconds}s")
-        self.text_correct.config(text=f"Correct: {self.text_counter[0]}")
-        self.text_incorrect.config(text=f"Incorrect: {self.text_counter[1]}")
+        if self.session is not None and self.session.recorder is not None:
+            self.session.recorder.close()  # Incomplete if it didn't finish
+        self.session = None
+        self.shown_counter = [0, 0]
+        self.ui.word_pool.refresh()
+        self.set_language_variable(self.language.get())  # Reload if changed
+        self.text_timer.config(text=self.get_time_text(self.seconds))
+        self.text_correct.config(text="Correct: 0")
+        self.text_incorrect.config(text="Incorrect: 0")
         return None
 
     def clear_canvas(self) -> None:
         """Clear all the canvas content and the related variables to it"""
+        self.text_engine.clear()
         self.canvas.delete("all")
-        self.canvas_text_id = None
-        self.canvas_text_idx = 0
         self.canvas_guide_id = None
-        self.canvas_guide_idx = 1
-        return None
-
-    def fill_words_list(self) -> None:
-        """Get the words from the files/{language}_words.txt file"""
-        with open(
-            file=f"files/{self.language.get()}_words.txt", mode="r"
-        ) as file:
-            # A line has only one word.
-            self.words: list = [
-                word.replace("\n", "") for word in file.readlines()
-            ]
         return None
 
-    def fill_specials_list(self) -> None:
-        """Get the special characters from the files/specials_file.txt file"""
-        with open(
-            file="files/specials_file.txt", mode="r"
-        ) as file:
-            # A line has only one special character.
-            self.specials: list = [
-                special.replace("\n", "") for special in file.readlines()
-            ]
-        return None
-
-    def fill_numbers_list(self) -> None:
-        """Get the number characters from the files/numbers_file.txt file"""
-        with open(
-            file="files/numbers_file.txt", mode="r"
-        ) as file:
-            # A line has only one number character.
-            self.numbers: list = [
-                number.replace("\n", "") for number in file.readlines()
-            ]
-        return None
+    def create_session(self) -> TypingSession:
+        """Create the typing session with the words of the current options"""
+        pool = self.ui.word_pool
+        packs = self.ui.language_packs
+        # The pack is checked after every test (see 'clear_test'), not here
+        words: PackCorpus = (
+            packs.get_opened(self.language.get())
+            or packs.get(self.language.get())
+        )
+        if self.frequency_words:
+            sampler = get_weighted_sampler(words)
+        else:
+            sampler = get_sampler(words)
+        if self.adaptive and self.ui.username:
+            sampler = self.create_adaptive_sampler(words, sampler)
+        seed: int = getrandbits(32)  # Saved in the recording
+        generator: TextGenerator = TextGenerator(
+            words=words,
+            specials=pool.get_specials() if self.specials else (),
+            numbers=pool.get_numbers() if self.numbers else (),
+            max_chars=self.max_chars,
+            seed=seed,
+            sampler=sampler
+        )
+        return TypingSession(
+            generator, self.seconds, recorder=self.create_recorder(seed)
+        )
 
-    def get_random_word(self) -> str:
-        """Return a random word from the initialized list"""
-        return choice(self.words)
-
-    def get_randon_special(self) -> str:
-        """Return a random special character from the initialized list"""
-        return choice(self.specials)
-
-    def get_random_number(self) -> str:
-        """Return a random number from the initialized list"""
-        return choice(self.numbers)
-
-    def create_text_line(self) -> str:
-        """Return a line with random words to be displayed in the canvas"""
-        line: list = []
-        line_length: int = 0
-        last_word = self.get_random_word()
-        line.append(last_word)
-        line_length += len(last_word)
-        while line_length < self.max_chars.get("canvas"):
-            word = self.get_random_word()
-            if word != last_word:
-                if (line_length + len(word)) < self.max_chars.get("canvas"):
-                    line.append(word)
-                    line_length += len(word)
-                    last_word = word
-                else:
-                    line_length += 1
-        if self.specials and self.numbers:
-            counter: int = 0
-            line_length: int = len(line) - 1
-            while (
-                    counter < self.max_chars.get("specials")
-                    + self.max_chars.get("numbers")
-            ):
-                random_idx = randint(0, line_length)
-                if counter % 2 == 0:
-                    line[random_idx] = self.get_randon_special()
-                else:
-                    line[random_idx] = self.get_random_number()
-                counter += 1
-        elif self.specials:
-            counter: int = 0
-            line_length: int = len(line) - 1
-            while counter < self.max_chars.get("specials"):
-                random_idx = randint(0, line_length)
-                line[random_idx] = self.get_randon_special()
-                counter += 1
-        elif self.numbers:
-            counter: int = 0
-            line_length: int = len(line) - 1
-            while counter < self.max_chars.get("numbers"):
-                random_idx = randint(0, line_length)
-                line[random_idx] = self.get_random_number()
-                counter += 1
-        return " ".join(line)
+    def create_adaptive_sampler(self, words, sampler):
+        """
+        Return a sampler that favors the words with the user's weakest
+        bigrams, or the received one if there isn't enough data yet or the
+        bigram index is still being built (in the background, never here)
+        """
+        index: dict = find_bigram_index(words)
+        if index is None:
+            Thread(target=self.load_bigram_index, daemon=True).start()
+            return sampler
+        weak_bigrams: list = self.ui.results_store.get_key_stats(
+            self.ui.username
+        ).get_weak_bigrams()
+        if not weak_bigrams:
+            return sampler
+        return AdaptiveSampler(sampler, index, weak_bigrams)
+
+    def create_recorder(self, seed: int):
+        """
+        Return the writer of the test's recording, or None if disabled.
+        Its file is opened once the test started (see 'start_typing_test')
+        """
+        if not self.record_sessions:
+            return None
+        flags: int = (
+            SPECIALS * self.specials | NUMBERS * self.numbers
+            | FREQUENCY_WORDS * self.frequency_words
+            | ADAPTIVE * self.adaptive
+        )
+        return RecordingWriter(
+            get_recording_path(), self.language.get(), self.seconds, seed,
+            self.ui.username, flags
+        )
 
+    @traced("MainUI.typing_test_text")
     def typing_test_text(self) -> None:
         """Initialize and create the text in the canvas for the typing test"""
-        text_lines = [
-            self.create_text_line(),
-            self.create_text_line(),
-            self.create_text_line(),
-            self.create_text_line(),
-        ]
-        full_text = "\n\n".join(text_lines)
-        self.canvas_text = full_text
-        self.canvas_text_id = self.canvas.create_text(
-            700, 370,  # Should be dinamically calculated
-            text=full_text,
-            font=self.ui.styles.get("canvas_label_font"),
-            fill=self.ui.styles.get("label_font_color"),
-            justify="center"
-        )
+        self.text_engine.set_lines(self.session.lines)
         self.typing_test_guide()
         return None
 
     def typing_test_guide(self) -> None:
         """Initialize and create the guide in the canvas for the typing text"""
-        guide: str = f"Line: {self.canvas_guide_idx}   "
-        guide += f"Next character: {self.canvas_text[self.canvas_text_idx]}"
+        guide: str = f"Line: {self.session.line_number}   "
+        guide += f"Next character: {self.session.current_char()}"
         self.canvas_guide_id = self.canvas.create_text(
             700, 80,
             text=guide,
@@ -445,106 +515,100 @@ class MainUI(Frame):
         )
         return None
 
+    @traced("MainUI.check_typing")
     def check_typing(self, event: Event) -> None:
-        """Compare the canvas text with the pressed key"""
-        if self.test_on and self.timer_on:
-            if event.keysym in self.no_keys:
-                return None
-            while self.canvas_text[self.canvas_text_idx] == "\n":
-                self.canvas_text_idx += 1
-            if event.char == self.canvas_text[self.canvas_text_idx]:
-                self.text_counter[0] += 1  # Correct
-                self.update_text_counter(0)
-            else:
-                self.text_counter[1] += 1  # Incorrect
-                self.update_text_counter(1)
-            self.canvas_text_idx += 1
-            if self.canvas_text_idx >= len(self.canvas_text):
-                self.clear_canvas()
-                self.typing_test_text()
-            self.update_guide()
+        """
+        Compare the canvas text with the pressed key. Only the test state is
+        updated here, the widgets are refreshed later by the render scheduler
+        """
+        if not self.test_on or not self.timer_on:
+            return None
+        if event.keysym in self.no_keys:
+            return None
+        correct, line_finished = self.session.feed_key(event.char)
+        self.renderer.mark("correct" if correct else "incorrect")
+        self.text_engine.advance(correct)
+        if line_finished:
+            # Recycle the finished line instead of redrawing everything
+            self.text_engine.scroll(self.session.lines[-1])
+            if self.prefetch_id is None:
+                self.prefetch_id = self.after_idle(self.prefetch_lines)
+        self.renderer.mark("cursor")
+        self.renderer.mark("guide")
+        return None
+
+    def prefetch_lines(self) -> None:
+        """Fill the session's queue of ready lines while the loop is idle"""
+        self.prefetch_id = None
+        if self.session is not None:
+            self.session.stream.fill()
+        return None
+
+    def cancel_prefetch(self) -> None:
+        """Cancel the pending lines prefetch if any"""
+        if self.prefetch_id is not None:
+            self.after_cancel(self.prefetch_id)
+            self.prefetch_id = None
         return None
 
     def update_text_counter(self, index: int) -> None:
         """Update the correct/incorrect text according to the received index"""
+        count: int = self.session.text_counter[index]
+        if self.shown_counter[index] == count:
+            return None
+        self.shown_counter[index] = count
         if index == 0:
-            self.text_correct.config(
-                text=f"Correct: {self.text_counter[index]}"
-            )
+            self.text_correct.config(text=f"Correct: {count}")
         else:
-            self.text_incorrect.config(
-                text=f"Incorrect: {self.text_counter[index]}"
-            )
+            self.text_incorrect.config(text=f"Incorrect: {count}")
         return None
 
+    @traced("MainUI.update_guide")
     def update_guide(self) -> None:
         """Update the canvas text guide as a whole single text"""
-        text_idx = self.canvas_text_idx
-        if self.canvas_text[text_idx] == "\n":
-            text_idx += 2
-            self.canvas_guide_idx += 1
-        updated_guide: str = f"Line: {self.canvas_guide_idx}   "
-        updated_guide += f"Next character: {self.canvas_text[text_idx]}"
+        updated_guide: str = f"Line: {self.session.line_number}   "
+        updated_guide += f"Next character: {self.session.current_char()}"
         self.canvas.itemconfig(self.canvas_guide_id, text=updated_guide)
         return None
 
     def show_test_results(self) -> None:
         """Show in the canvas the results of the typing test"""
         self.clear_canvas()
-        language: str = f"Language: {self.language.get()}"
-        self.canvas.create_text(
-            400, 200,
-            text=language,
-            font=self.ui.styles.get("canvas_label_font"),
-            fill=self.ui.styles.get("label_font_color"),
-            justify="center"
-        )
-        incorrect: str = f"Incorrect: {self.text_counter[1]}"
-        self.canvas.create_text(
-            400, 400,
-            text=incorrect,
-            font=self.ui.styles.get("canvas_label_font"),
-            fill=self.ui.styles.get("label_font_color"),
-            justify="center"
-        )
-
-        raw: str = f"Raw: {self.text_counter[0] + self.text_counter[1]}"
-        self.canvas.create_text(
-            750, 200,
-            text=raw,
-            font=self.ui.styles.get("canvas_label_font"),
-            fill=self.ui.styles.get("label_font_color"),
-            justify="center"
-        )
-        wpm: str = f"WPM: {self.calculate_wpm()}"
-        self.canvas.create_text(
-            750, 400,
-            text=wpm, font=self.ui.styles.get("canvas_label_font"),
-            fill=self.ui.styles.get("label_font_color"),
-            justify="center"
-        )
-
-        seconds: str = f"Seconds: {self.seconds}"
-        self.canvas.create_text(
-            1100, 200,
-            text=seconds,
-            font=self.ui.styles.get("canvas_label_font"),
-            fill=self.ui.styles.get("label_font_color"),
-            justify="center"
-        )
-        correct: str = f"Correct: {self.text_counter[0]}"
-        self.canvas.create_text(
-            1100, 400,
-            text=correct,
-            font=self.ui.styles.get("canvas_label_font"),
-            fill=self.ui.styles.get("label_font_color"),
-            justify="center"
-        )
+        self.session.finish_recording()
+        results: dict = self.calculate_results()
+        if self.ui.username:
+            recording: str = None
+            recorder: RecordingWriter = self.session.recorder
+            if recorder is not None and not recorder.failed:
+                recording = get_recording_name(recorder.file_name)
+            timestamps, expected, _, correct = (
+                self.session.keystroke_log.get_columns()
+            )
+            self.ui.results_store.save_async(
+                self.ui.username, self.language.get(), results, recording,
+                (timestamps, expected, correct)
+            )
+        results_config: list = [
+            (f"Language: {self.language.get()}", 300, 150),
+            (f"WPM: {results.get('wpm')}", 700, 150),
+            (f"Seconds: {results.get('seconds')}", 1100, 150),
+            (f"Raw: {results.get('raw_wpm')}", 300, 350),
+            (f"Accuracy: {results.get('accuracy'):.0f}%", 700, 350),
+            (f"Correct: {results.get('correct')}", 1100, 350),
+            (f"Burst: {results.get('burst')}", 300, 550),
+            (f"Variation: {results.get('consistency'):.0f}%", 700, 550),
+            (f"Incorrect: {results.get('incorrect')}", 1100, 550)
+        ]
+        for text, x, y in results_config:
+            self.canvas.create_text(
+                x, y,
+                text=text,
+                font=self.ui.styles.get("canvas_label_font"),
+                fill=self.ui.styles.get("label_font_color"),
+                justify="center"
+            )
         return None
 
-    def calculate_wpm(self) -> int:
-        """Calculate the wpm"""
-        if self.text_counter[0] != 0:
-            wpm = floor((self.text_counter[0] / 5) * (60 / self.seconds))
-            return wpm
-        return 0
+    def calculate_results(self) -> dict:
+        """Calculate all the results of the test from the keystroke log"""
+        return self.session.results()
@@ -0,0 +1,116 @@
+from tkinter import Misc
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import pbkdf2_hmac, sha256
+from hmac import compare_digest
+from typing import Callable
+from os import urandom
+import time
+
+
+class PasswordHasher:
+    def __init__(self, root: Misc, iterations: int = 600_000):
+        self.root: Misc = root
+        self.algorithm: str = "pbkdf2_sha256"
+        self.iterations: int = iterations  # Cost of a single hash
+        self.poll_ms: int = 10
+        # hashlib releases the GIL while hashing, so the Tk loop keeps going
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+
+    def hash(self, password: str, iterations: int = None) -> str:
+        """
+        Return the salted hash of the password as:
+        algorithm$iterations$salt$hash
+        """
+        iterations = iterations or self.iterations
+        salt: bytes = urandom(16)
+        digest: bytes = pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), salt, iterations
+        )
+        return f"{self.algorithm}${iterations}${salt.hex()}${digest.hex()}"
+
+    def verify(self, password: str, stored: str) -> tuple:
+        """
+        Check the password against the stored hash and return a tuple:
+        (is_valid, needs_rehash). Unsalted SHA256 hashes (legacy) are
+        accepted but always need to be rehashed
+        """
+        if "$" not in stored:
+            legacy: str = sha256(password.encode("utf-8")).hexdigest()
+            return compare_digest(legacy, stored), True
+        parts: list = stored.split("$")
+        if len(parts) != 4:
+            raise ValueError("The stored password hash is malformed")
+        algorithm, iterations, salt, digest = parts
+        if algorithm != self.algorithm:
+            raise ValueError("The password hash algorithm isn't supported")
+        computed: bytes = pbkdf2_hmac(
+            "sha256", password.encode("utf-8"),
+            bytes.fromhex(salt), int(iterations)
+        )
+        is_valid: bool = compare_digest(computed.hex(), digest)
+        return is_valid, int(iterations) < self.iterations
+
+    def run_async(
+            self,
+            callback: Callable,
+            function: Callable,
+            *args,
+            on_error: Callable = None
+    ) -> None:
+        """
+        Run the function in the worker thread and call the callback with
+        its result from the Tk loop. If the function raises, on_error is
+        called with the exception instead (it's printed if there's none)
+        """
+        future: Future = self.executor.submit(function, *args)
+
+        def poll() -> None:
+            if future.done():
+                error: BaseException = future.exception()
+                if error is None:
+                    callback(future.result())
+                elif on_error is not None:
+                    on_error(error)
+                else:
+                    print(error)
+            else:
+                self.root.after(self.poll_ms, poll)
+            return None
+
+        self.root.after(self.poll_ms, poll)
+        return None
+
+    def hash_async(
+            self, password: str, callback: Callable, on_error: Callable = None
+    ) -> None:
+        """Hash the password off the Tk loop and pass it to the callback"""
+        self.run_async(callback, self.hash, password, on_error=on_error)
+        return None
+
+    def verify_async(
+            self,
+            password: str,
+            stored: str,
+            callback: Callable,
+            on_error: Callable = None
+    ) -> None:
+        """Verify the password off the Tk loop, see 'verify'"""
+        self.run_async(
+            callback, self.verify, password, stored, on_error=on_error
+        )
+        return None
+
+    def measure(self, iterations: int, rounds: int = 3) -> float:
+        """Return the best time in milliseconds to hash with the iterations"""
+        best: float = float("inf")
+        for _ in range(rounds):
+            start: float = time.perf_counter()
+            self.hash("benchmark", iterations)
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    def tune(self, target_ms: float) -> int:
+        """Return the iterations needed for a hash to take the target time"""
+        sample: int = 100_000
+        elapsed: float = self.measure(sample)
+        return max(1, int(sample * target_ms / elapsed))
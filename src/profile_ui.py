@@ -1,5 +1,10 @@
-from tkinter import Frame, Tk, Button, Label, Text, END, Event
+from tkinter import Frame, Tk, Button, Canvas, Label, Text, END, Event
 from typing import cast
+from time import localtime, strftime
+
+KEYBOARD_ROWS: tuple = ("1234567890", "qwertyuiop", "asdfghjklñ", "zxcvbnm,.")
+FAST_COLOR: tuple = (0x7C, 0xC5, 0x76)
+SLOW_COLOR: tuple = (0xE0, 0x5A, 0x47)
 
 
 class ProfileUI(Frame):
@@ -11,11 +16,18 @@ class ProfileUI(Frame):
         self.wpm60secs: Label = cast(Label, None)
         self.wpm90secs: Label = cast(Label, None)
         self.wpm120secs: Label = cast(Label, None)
+        self.history_before: float = None  # Oldest history entry shown
+        self.history_page: int = 50
+        self.heatmap: Canvas = cast(Canvas, None)
+        self.heatmap_items: dict = {}  # {char: (rectangle, text)}
+        self.label_bigrams: Label = cast(Label, None)
+        self.heatmap_min_keys: int = 5  # Keys needed to color a key
         self.bindings: list = []
         self.bind_ids: list = []
         self.configure_layout()
         self.create_top_bar()
         self.create_metric_displays()
+        self.create_key_heatmap()
 
     def configure_layout(self) -> None:
         """Configure the main layout and the grid to be used"""
@@ -25,10 +37,17 @@ class ProfileUI(Frame):
         return None
 
     def on_frame_activation(self) -> None:
-        """Set the frame's key bindings and save them for later use"""
+        """
+        Set the frame's key bindings, save them for later use and show the
+        metrics of the logged user
+        """
         for bind, callback in self.bindings:
             bindId = self.master.bind(bind, callback)
             self.bind_ids.append((bind, bindId))
+        self.load_metrics()
+        self.load_key_stats()
+        self.clear_history()
+        self.load_history()
         return None
 
     def on_frame_deactivation(self) -> None:
@@ -61,7 +80,7 @@ class ProfileUI(Frame):
         option_btn_config: list = [
             ("Typing", self.switch_to_main, 0),
             ("Login", self.switch_to_login, 4),
-            ("Logout", self.switch_to_login, 6)
+            ("Logout", self.logout, 6)
         ]
         for text, command, col in option_btn_config:
             btn: Button = Button(
@@ -158,9 +177,187 @@ class ProfileUI(Frame):
         self.text_history.grid(
             row=1, column=4, sticky="new", rowspan=2, padx=10, pady=5
         )
-        self.text_history.insert(
-            END, "Your typing session history will appear here."
+        self.text_history.config(state="disabled")
+        more_btn: Button = Button(
+            metric_frame,
+            text="More",
+            command=self.load_history,
+            bg=self.ui.styles.get("background_color"),
+            fg=self.ui.styles.get("button_font_color"),
+            font=self.ui.styles.get("body_label_font"),
+            relief="flat",
+            activebackground=self.ui.styles.get("button_active_color"),
+            borderwidth=0,
+            cursor="center_ptr"
+        )
+        more_btn.grid(row=3, column=4, sticky="ew", padx=10, pady=5)
+        setattr(self, "btnMore", more_btn)
+        return None
+
+    def create_key_heatmap(self) -> None:
+        """Create the keyboard heatmap and the label of the slowest bigrams"""
+        heatmap_frame: Frame = Frame(
+            self, bg=self.ui.styles.get("background_color"), relief="flat"
+        )
+        heatmap_frame.grid(row=2, column=0, sticky="ew", pady=10)
+        heatmap_frame.grid_columnconfigure(0, weight=1)
+        label: Label = Label(
+            heatmap_frame,
+            text="Keys",
+            font=self.ui.styles.get("title_label_font"),
+            fg=self.ui.styles.get("label_font_color"),
+            bg=self.ui.styles.get("background_color")
+        )
+        label.grid(row=0, column=0, sticky="ew", padx=10, pady=5)
+        setattr(self, "labelKeys", label)
+        key_size: int = 60
+        gap: int = 6
+        self.heatmap = Canvas(
+            heatmap_frame,
+            width=len(KEYBOARD_ROWS[0]) * (key_size + gap) + 2 * key_size,
+            height=len(KEYBOARD_ROWS) * (key_size + gap),
+            bg=self.ui.styles.get("background_color"),
+            highlightthickness=0
+        )
+        self.heatmap.grid(row=1, column=0, padx=10, pady=5)
+        for row, keys in enumerate(KEYBOARD_ROWS):
+            y: int = row * (key_size + gap)
+            for column, char in enumerate(keys):
+                x: int = column * (key_size + gap) + row * key_size // 2
+                rectangle: int = self.heatmap.create_rectangle(
+                    x, y, x + key_size, y + key_size,
+                    fill=self.ui.styles.get("canvas_color"), width=0
+                )
+                text: int = self.heatmap.create_text(
+                    x + key_size / 2, y + key_size / 2,
+                    text=char,
+                    font=("Segoe UI", 12, "normal"),
+                    fill=self.ui.styles.get("label_font_color"),
+                    justify="center"
+                )
+                self.heatmap_items[char] = (rectangle, text)
+        self.label_bigrams = Label(
+            heatmap_frame,
+            text="",
+            font=self.ui.styles.get("body_label_font"),
+            fg=self.ui.styles.get("label_font_color"),
+            bg=self.ui.styles.get("background_color")
+        )
+        self.label_bigrams.grid(row=2, column=0, sticky="ew", padx=10, pady=5)
+        return None
+
+    @staticmethod
+    def get_heat_color(fraction: float) -> str:
+        """Return the color between the fast (0) and the slow (1) ones"""
+        channels: list = [
+            round(fast + (slow - fast) * fraction)
+            for fast, slow in zip(FAST_COLOR, SLOW_COLOR)
+        ]
+        return "#{:02X}{:02X}{:02X}".format(*channels)
+
+    def load_key_stats(self) -> None:
+        """
+        Color every key by its mean latency (from the fastest to the
+        slowest key) and show the user's slowest bigrams
+        """
+        stats: dict = {}  # {char: (keys, error rate, mean latency)}
+        bigrams: list = []
+        if self.ui.username:
+            key_stats = self.ui.results_store.get_key_stats(self.ui.username)
+            stats = {
+                char: key_stats.get_combined(char + char.upper())
+                for char in self.heatmap_items
+            }
+            bigrams = key_stats.get_slowest_bigrams()
+        means: list = [
+            mean for keys, _, mean in stats.values()
+            if keys >= self.heatmap_min_keys
+        ]
+        fastest: float = min(means, default=0.0)
+        spread: float = max(means, default=0.0) - fastest
+        for char, (rectangle, text) in self.heatmap_items.items():
+            keys, error_rate, mean = stats.get(char, (0, 0.0, 0.0))
+            if keys < self.heatmap_min_keys:
+                self.heatmap.itemconfig(
+                    rectangle, fill=self.ui.styles.get("canvas_color")
+                )
+                self.heatmap.itemconfig(text, text=char)
+                continue
+            fraction: float = (mean - fastest) / spread if spread else 0.0
+            self.heatmap.itemconfig(
+                rectangle, fill=self.get_heat_color(fraction)
+            )
+            self.heatmap.itemconfig(
+                text, text=f"{char}\n{mean:.0f}ms\n{error_rate:.0%}"
+            )
+        if bigrams:
+            self.label_bigrams.config(text="Slowest pairs:   " + "   ".join(
+                f"'{bigram}' {mean:.0f}ms {error_rate:.0%}"
+                for bigram, mean, error_rate in bigrams
+            ))
+        else:
+            self.label_bigrams.config(text="No key stats yet")
+        return None
+
+    def load_metrics(self) -> None:
+        """Show the best and average wpm of the user per test duration"""
+        summary: dict = {}
+        if self.ui.username:
+            summary = self.ui.results_store.get_summary(self.ui.username)
+        labels: list = [
+            (30, self.wpm30secs),
+            (60, self.wpm60secs),
+            (90, self.wpm90secs),
+            (120, self.wpm120secs)
+        ]
+        for seconds, label in labels:
+            if seconds in summary:
+                best, average = summary.get(seconds)
+                label.config(text=f"Best: {best}\nAverage: {average:.0f}")
+            else:
+                label.config(text="No tests yet")
+        return None
+
+    def load_history(self) -> None:
+        """Append the next page of the user's history to the text"""
+        if not self.ui.username:
+            return None
+        rows: list = self.ui.results_store.get_history(
+            self.ui.username, self.history_before, self.history_page
         )
+        if not rows:
+            if self.history_before is None:
+                self.write_history(
+                    "Your typing session history will appear here."
+                )
+            return None
+        self.history_before = rows[-1][0]
+        lines: list = [
+            f"{strftime('%Y-%m-%d %H:%M', localtime(created_at))}  "
+            f"{self.get_duration_text(seconds, elapsed)}  "
+            f"{language}  {wpm} wpm  {accuracy:.0f}%\n"
+            for created_at, seconds, elapsed, language, wpm, accuracy in rows
+        ]
+        self.write_history("".join(lines))
+        return None
+
+    @staticmethod
+    def get_duration_text(seconds: int, elapsed: int) -> str:
+        """Return the duration of a test, or how long it lasted if endless"""
+        return f"{seconds}s" if seconds else f"endless {elapsed}s"
+
+    def clear_history(self) -> None:
+        """Clear the history text and start again from the newest entry"""
+        self.history_before = None
+        self.text_history.config(state="normal")
+        self.text_history.delete("1.0", END)
+        self.text_history.config(state="disabled")
+        return None
+
+    def write_history(self, text: str) -> None:
+        """Append the received text to the read-only history text"""
+        self.text_history.config(state="normal")
+        self.text_history.insert(END, text)
         self.text_history.config(state="disabled")
         return None
 
@@ -173,3 +370,9 @@ class ProfileUI(Frame):
         """Switch to login frame from the profile frame"""
         self.ui.switch_frame(frameClassName="LoginUI")
         return None
+
+    def logout(self) -> None:
+        """Forget the logged user and switch to the login frame"""
+        self.ui.username = ""
+        self.switch_to_login()
+        return None
@@ -1,6 +1,4 @@
-from tkinter import Frame, Tk, Button, Entry, Label, Event, messagebox, END
-from json import dump, load
-from hashlib import sha256
+from tkinter import Frame, Tk, Button, Entry, Label, Event, END
 from typing import cast
 
 
@@ -15,6 +13,7 @@ class RegisterUI(Frame):
             ("<Return>", self.check_register_form),
         ]
         self.binds_id: list = []
+        self.saving: bool = False  # The password is being hashed
         self.configure_layout()
         self.create_form()
 
@@ -33,10 +32,11 @@ class RegisterUI(Frame):
         return None
 
     def on_frame_deactivation(self) -> None:
-        """Unset the frame's key bindings and clear the list"""
+        """Unset the frame's key bindings, clear the list and the form"""
         for seq, bId in self.binds_id:
             self.master.unbind(seq, bId)
         self.binds_id = []
+        self.clear_form()
         return None
 
     def create_form(self) -> None:
@@ -119,16 +119,50 @@ class RegisterUI(Frame):
 
     def check_register_form(self, event: Event = None) -> None:
         """Check and validate the form inputs to create access credentials"""
+        from tkinter import messagebox  # Imported when it's first needed
         email = self.input_email.get()
         username = self.input_user.get()
         password = self.input_password.get()
+        if self.saving:
+            return None
         if len(email) == 0 or len(username) == 0 or len(password) == 0:
             messagebox.showerror(
                 title="Error registering",
                 message="Don't leave blank inputs. Try again!"
             )
             return None
-        self.save_credentials(email, username, password)
+        if self.ui.credential_store.get_user(username) is not None:
+            self.show_duplicate_error()
+            return None
+        self.saving = True
+        self.ui.password_hasher.hash_async(
+            password,
+            lambda hashed: self.finish_register(email, username, hashed),
+            self.fail_register
+        )
+        return None
+
+    def fail_register(self, error: BaseException) -> None:
+        """Show why the password couldn't be hashed"""
+        from tkinter import messagebox
+        self.saving = False
+        print(error)
+        messagebox.showerror(
+            title="Error registering",
+            message=f"The password couldn't be saved: {error}"
+        )
+        return None
+
+    def finish_register(self, email: str, username: str, hashed: str) -> None:
+        """Save the credentials once the password has been hashed"""
+        from tkinter import messagebox
+        self.saving = False
+        try:
+            self.save_credentials(email, username, hashed)
+        except ValueError:
+            self.show_duplicate_error()
+            return None
+        self.ui.username = username
         messagebox.showinfo(
             title="Successful registering",
             message="Credentials successfully saved!"
@@ -137,29 +171,20 @@ class RegisterUI(Frame):
         self.switch_to_main()
         return None
 
-    def save_credentials(self, email: str, user: str, password: str) -> None:
-        """Save the credentials old and new ones"""
-        file_name: str = "src/local_users_credentials.json"
-        try:
-            with open(file=file_name, mode="r") as file:
-                data: dict = load(file)
-        except FileNotFoundError as e:
-            print(e)
-            data: dict = {"users": []}
-        credentials: dict = {
-            "email": email,
-            "username": user,
-            "password": self.hash_password(password)
-        }
-        data["users"].append(credentials)
-        with open(file=file_name, mode="w") as json:
-            dump(data, json, indent=4)
+    @staticmethod
+    def show_duplicate_error() -> None:
+        """Show the error of a username that is already registered"""
+        from tkinter import messagebox
+        messagebox.showerror(
+            title="Error registering",
+            message="The username already exists. Try another one!"
+        )
         return None
 
-    @staticmethod
-    def hash_password(password: str) -> str:
-        """Return the received password as a SHA256 hash"""
-        return sha256(password.encode("utf-8")).hexdigest()
+    def save_credentials(self, email: str, user: str, hashed: str) -> None:
+        """Save the new credentials (password already hashed) in the store"""
+        self.ui.credential_store.add_user(email, user, hashed)
+        return None
 
     def clear_form(self) -> None:
         """Clear the form inputs"""
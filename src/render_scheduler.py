@@ -0,0 +1,60 @@
+from tkinter import Misc
+from typing import Callable
+from math import ceil
+import time
+from tracing import traced
+
+
+class RenderScheduler:
+    def __init__(self, widget: Misc, frame_ms: int = 16):
+        self.widget: Misc = widget
+        self.frame_ms: int = frame_ms  # Minimum time between two flushes
+        self.renderers: dict = {}  # {field: callback}, in flush order
+        self.dirty: set = set()
+        self.after_id = None
+        self.last_flush_ms: float = 0.0
+
+    def register(self, field: str, callback: Callable[[], None]) -> None:
+        """Register the callback that redraws the received field"""
+        self.renderers[field] = callback
+        return None
+
+    def mark(self, field: str) -> None:
+        """Mark the field as dirty and schedule a flush if there isn't one"""
+        self.dirty.add(field)
+        if self.after_id is None:
+            # A flush slower than the frame delays the next one, so the
+            # redraw cost stays flat no matter how many keys are pressed
+            delay_ms: int = max(self.frame_ms, ceil(self.last_flush_ms))
+            self.after_id = self.widget.after(delay_ms, self.flush)
+        return None
+
+    @traced("RenderScheduler.flush")
+    def flush(self) -> None:
+        """Redraw every dirty field once, in the order they were registered"""
+        self.after_id = None
+        if not self.dirty:
+            return None
+        start: float = time.perf_counter()
+        dirty: set = self.dirty
+        self.dirty = set()
+        for field, callback in self.renderers.items():
+            if field in dirty:
+                callback()
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        return None
+
+    def flush_now(self) -> None:
+        """Cancel the scheduled flush and redraw the dirty fields right now"""
+        self.cancel(keep_dirty=True)
+        self.flush()
+        return None
+
+    def cancel(self, keep_dirty: bool = False) -> None:
+        """Cancel the scheduled flush, dropping the dirty fields by default"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        if not keep_dirty:
+            self.dirty = set()
+        return None
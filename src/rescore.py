@@ -0,0 +1,176 @@
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from math import ceil
+from os import cpu_count, remove, replace, scandir
+from os.path import join
+from typing import Iterator
+import argparse
+from results_engine import NS_PER_SECOND, compute_results
+from results_store import RESULTS_FILE, ResultsStore
+from session_recording import RECORDINGS_DIRECTORY, RECORDING_SUFFIX
+from session_recording import RecordingReader
+
+PROGRESS_FILE: str = "rescore.progress"  # Last rescored recording
+SCORES: tuple = (  # Results sent back by the workers
+    "wpm", "raw_wpm", "accuracy", "consistency", "correct", "incorrect"
+)
+
+
+def iter_recordings(directory: str, after: str = "") -> Iterator[str]:
+    """
+    Yield the names ('<year-month>/<file>') of the recordings in the
+    directory, oldest first, skipping the ones up to 'after'
+    """
+    try:
+        months: list = sorted(
+            entry.name for entry in scandir(directory) if entry.is_dir()
+        )
+    except FileNotFoundError:
+        return  # Nothing was recorded yet
+    for month in months:
+        if month < after[:len(month)]:
+            continue
+        names: list = sorted(
+            entry.name for entry in scandir(join(directory, month))
+            if entry.name.endswith(RECORDING_SUFFIX)
+        )
+        for name in names:
+            recording: str = f"{month}/{name}"
+            if recording > after:
+                yield recording
+
+
+def score_recording(file_name: str) -> dict:
+    """
+    Return the results of the recording computed with the current scoring
+    code, or None if it's broken or the test didn't finish
+    """
+    try:
+        reader: RecordingReader = RecordingReader(file_name)
+    except (OSError, ValueError) as e:
+        print(e)
+        return None
+    try:
+        timestamps: array = array("q")
+        correct: array = array("b")
+        for event in reader:
+            timestamps.append(event.offset_ns)
+            correct.append(event.correct)
+        if not reader.complete:
+            return None
+        seconds: int = reader.seconds or max(
+            1, ceil(reader.elapsed_ns / NS_PER_SECOND)
+        )
+        return compute_results(timestamps, correct, 0, seconds)
+    finally:
+        reader.close()
+
+
+def score_chunk(directory: str, recordings: list) -> list:
+    """
+    Score the recordings (runs in a worker process), return the scored
+    ones as (recording, scores) pairs
+    """
+    rows: list = []
+    for recording in recordings:
+        results: dict = score_recording(join(directory, recording))
+        if results is not None:
+            rows.append((recording, {key: results[key] for key in SCORES}))
+    return rows
+
+
+def read_progress(directory: str) -> str:
+    """Return the last rescored recording of an interrupted run, if any"""
+    try:
+        with open(file=join(directory, PROGRESS_FILE), mode="r") as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def write_progress(directory: str, recording: str) -> None:
+    """Save the last rescored recording, replacing the file atomically"""
+    file_name: str = join(directory, PROGRESS_FILE)
+    with open(file=f"{file_name}.tmp", mode="w") as file:
+        file.write(recording)
+    replace(f"{file_name}.tmp", file_name)
+    return None
+
+
+def rescore(
+        store: ResultsStore,
+        directory: str = RECORDINGS_DIRECTORY,
+        workers: int = None,
+        chunk_size: int = 256,
+        restart: bool = False
+) -> tuple:
+    """
+    Score every recording again and update their results. The recordings
+    are streamed in chunks to the worker processes, keeping only a few
+    chunks in flight, and the results of each chunk are updated in a
+    single transaction, in order. The last updated recording is saved, so
+    an interrupted run continues from there (unless restart is set).
+    Return (scored recordings, updated results)
+    """
+    workers = workers or cpu_count() or 1
+    after: str = "" if restart else read_progress(directory)
+    recordings: Iterator[str] = iter_recordings(directory, after)
+    connection = store.connect()
+    pending: deque = deque()  # [(last recording, future)]
+    scored: int = 0
+    updated: int = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(pending) < workers * 2:
+                chunk: list = list(islice(recordings, chunk_size))
+                if not chunk:
+                    break
+                pending.append(
+                    (chunk[-1], executor.submit(score_chunk, directory, chunk))
+                )
+            if not pending:
+                break
+            last, future = pending.popleft()
+            rows: list = future.result()
+            scored += len(rows)
+            updated += store.update_scores(connection, rows)
+            write_progress(directory, last)
+            print(f"Rescored {scored} recordings up to {last}, "
+                  f"{updated} results updated")
+    connection.close()
+    try:
+        remove(join(directory, PROGRESS_FILE))  # The next run starts over
+    except FileNotFoundError:
+        pass
+    return scored, updated
+
+
+def main() -> None:
+    """Parse the arguments and rescore the recordings"""
+    parser = argparse.ArgumentParser(
+        description="Score the recorded tests again with the current code"
+    )
+    parser.add_argument("--database", default=RESULTS_FILE)
+    parser.add_argument("--recordings", default=RECORDINGS_DIRECTORY)
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: cores)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="start over instead of continuing an interrupted run"
+    )
+    args = parser.parse_args()
+    scored, updated = rescore(
+        ResultsStore(args.database), args.recordings, args.workers,
+        args.chunk_size, args.restart
+    )
+    print(f"Done: {scored} recordings scored, {updated} results updated")
+    return None
+
+
+if __name__ == "__main__":
+    main()
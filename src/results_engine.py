@@ -0,0 +1,107 @@
+from math import ceil, floor, sqrt
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, a pure Python version is used
+    numpy = None
+
+NS_PER_SECOND: int = 1_000_000_000
+CHARS_PER_WORD: int = 5
+
+
+def calculate_wpm(chars: int, seconds: float) -> int:
+    """Return the words per minute of the characters typed in the seconds"""
+    if chars == 0 or seconds <= 0:
+        return 0
+    return floor((chars / CHARS_PER_WORD) * (60 / seconds))
+
+
+def get_series_stats(series: list) -> tuple:
+    """Return the max and the coefficient of variation (%) of the series"""
+    if not series:
+        return 0, 0.0
+    mean: float = sum(series) / len(series)
+    if mean == 0:
+        return max(series), 0.0
+    variance: float = sum((value - mean) ** 2 for value in series)
+    variance /= len(series)
+    return max(series), sqrt(variance) / mean * 100
+
+
+def count_per_second(
+        timestamps, correct, start_ns: int, seconds: int
+) -> tuple:
+    """
+    Return the keys and the correct keys typed in each second of the test
+    as two lists: (keys, correct_keys)
+    """
+    keys: list = [0] * seconds
+    correct_keys: list = [0] * seconds
+    last: int = seconds - 1
+    for timestamp, is_correct in zip(timestamps, correct):
+        second: int = (timestamp - start_ns) // NS_PER_SECOND
+        second = 0 if second < 0 else last if second > last else second
+        keys[second] += 1
+        correct_keys[second] += is_correct
+    return keys, correct_keys
+
+
+def count_per_second_numpy(
+        timestamps, correct, start_ns: int, seconds: int
+) -> tuple:
+    """Same as 'count_per_second' but vectorized with NumPy"""
+    stamps = numpy.frombuffer(timestamps, dtype=numpy.int64)
+    hits = numpy.frombuffer(correct, dtype=numpy.int8)
+    bins = numpy.clip((stamps - start_ns) // NS_PER_SECOND, 0, seconds - 1)
+    keys = numpy.bincount(bins, minlength=seconds)
+    correct_keys = numpy.bincount(bins, weights=hits, minlength=seconds)
+    return keys.tolist(), correct_keys.astype(numpy.int64).tolist()
+
+
+def compute_results(
+        timestamps,
+        correct,
+        start_ns: int,
+        seconds: int,
+        totals: tuple = None,
+        series_start_ns: int = None
+) -> dict:
+    """
+    Compute the results of a whole test from the keystroke log columns:
+    'timestamps' (perf_counter_ns, array "q") and 'correct' (array "b").
+    The totals (correct, incorrect), if received, replace the ones counted
+    from the columns, and the per-second series can start later than the
+    test when the columns only have its last keys
+    """
+    if series_start_ns is None:
+        series_start_ns = start_ns
+    skipped: float = (series_start_ns - start_ns) / NS_PER_SECOND
+    bins: int = max(1, ceil(seconds - skipped))
+    if numpy is not None and len(timestamps) > 0:
+        keys, correct_keys = count_per_second_numpy(
+            timestamps, correct, series_start_ns, bins
+        )
+    else:
+        keys, correct_keys = count_per_second(
+            timestamps, correct, series_start_ns, bins
+        )
+    if totals is None:
+        hits: int = sum(correct_keys)
+        total: int = sum(keys)
+    else:
+        hits: int = totals[0]
+        total: int = totals[0] + totals[1]
+    raw_series: list = [keys_typed * 60 // 5 for keys_typed in keys]
+    wpm_series: list = [hits_typed * 60 // 5 for hits_typed in correct_keys]
+    burst, consistency = get_series_stats(raw_series)
+    return {
+        "correct": hits,
+        "incorrect": total - hits,
+        "wpm": calculate_wpm(hits, seconds),
+        "raw_wpm": calculate_wpm(total, seconds),
+        "accuracy": hits / total * 100 if total else 0.0,
+        "wpm_series": wpm_series,
+        "burst": burst,
+        "consistency": consistency,  # Coefficient of variation (%)
+        "seconds": seconds
+    }
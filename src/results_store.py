@@ -0,0 +1,238 @@
+from os.path import abspath, dirname, join
+from threading import Thread
+from queue import Queue
+import sqlite3
+import time
+import zlib
+from key_stats import KeyStats
+
+# Next to the source files, wherever the app is started from
+RESULTS_FILE: str = join(dirname(abspath(__file__)), "local_results.db")
+
+
+class ResultsStore:
+    def __init__(self, file_name: str = RESULTS_FILE):
+        self.file_name: str = file_name
+        self.connection: sqlite3.Connection = None  # Used by the Tk thread
+        self.queue: Queue = Queue()
+        self.writer: Thread = None
+
+    def connect(self) -> sqlite3.Connection:
+        """Return a new connection to the database, creating the tables"""
+        connection = sqlite3.connect(self.file_name)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                username TEXT NOT NULL,
+                seconds INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                wpm INTEGER NOT NULL,
+                raw_wpm INTEGER NOT NULL,
+                accuracy REAL NOT NULL,
+                consistency REAL NOT NULL,
+                correct INTEGER NOT NULL,
+                incorrect INTEGER NOT NULL,
+                recording TEXT,
+                elapsed INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS results_user_seconds
+                ON results (username, seconds, wpm);
+            CREATE INDEX IF NOT EXISTS results_user_created
+                ON results (username, created_at);
+            CREATE INDEX IF NOT EXISTS results_user_language
+                ON results (username, language, created_at);
+            CREATE TABLE IF NOT EXISTS key_stats (
+                username TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            );
+        """)
+        columns: set = {
+            row[1] for row in connection.execute("PRAGMA table_info(results)")
+        }
+        if "recording" not in columns:  # Databases made before recordings
+            connection.execute("ALTER TABLE results ADD COLUMN recording TEXT")
+        if "elapsed" not in columns:  # Before endless tests were told apart
+            connection.execute(
+                "ALTER TABLE results ADD COLUMN elapsed INTEGER"
+            )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_recording "
+            "ON results (recording)"
+        )
+        return connection
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Return the connection used for reading, opening it if needed"""
+        if self.connection is None:
+            self.connection = self.connect()
+        return self.connection
+
+    def save(
+            self,
+            connection: sqlite3.Connection,
+            username: str,
+            language: str,
+            results: dict,
+            recording: str = None,
+            keys: tuple = None
+    ) -> None:
+        """
+        Insert the results of a test using the received connection. Its
+        duration is saved as 'seconds' (0 if endless) and the time it
+        lasted as 'elapsed', with the path of its recording (relative to
+        the recordings directory). The keys (timestamps, expected,
+        correct) of the test, if received, are added to the user's key
+        stats in the same transaction
+        """
+        with connection:
+            if keys is not None:
+                key_stats: KeyStats = KeyStats()
+                key_stats.add_session(*keys)
+                self.merge_key_stats(connection, username, key_stats)
+            connection.execute(
+                "INSERT INTO results (username, seconds, language, "
+                "created_at, wpm, raw_wpm, accuracy, consistency, correct, "
+                "incorrect, recording, elapsed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    username,
+                    0 if results.get("endless") else results.get("seconds"),
+                    language, time.time(),
+                    results.get("wpm"), results.get("raw_wpm"),
+                    results.get("accuracy"), results.get("consistency"),
+                    results.get("correct"), results.get("incorrect"),
+                    recording, results.get("seconds")
+                )
+            )
+        return None
+
+    def save_async(
+            self,
+            username: str,
+            language: str,
+            results: dict,
+            recording: str = None,
+            keys: tuple = None
+    ) -> None:
+        """Queue the results to be saved by the writer thread"""
+        if self.writer is None:
+            self.writer = Thread(target=self.write_queued, daemon=True)
+            self.writer.start()
+        self.queue.put((username, language, results, recording, keys))
+        return None
+
+    def write_queued(self) -> None:
+        """
+        Save the queued results forever (runs in the writer thread). The
+        connection is opened with the first result, and again with the
+        next ones if it fails, so the thread never dies with results queued
+        """
+        connection: sqlite3.Connection = None
+        while True:
+            username, language, results, recording, keys = self.queue.get()
+            try:
+                if connection is None:
+                    connection = self.connect()
+                self.save(
+                    connection, username, language, results, recording, keys
+                )
+            except Exception as e:  # The thread must keep saving the rest
+                print(e)
+            finally:
+                self.queue.task_done()  # Even if it failed, see 'wait_writes'
+
+    def wait_writes(self) -> None:
+        """
+        Block until every queued result has been saved (the writer thread
+        is a daemon, so the results still queued on exit would be lost)
+        """
+        self.queue.join()
+        return None
+
+    def get_key_stats(
+            self, username: str, connection: sqlite3.Connection = None
+    ) -> KeyStats:
+        """Return the user's key stats, empty if there aren't any yet"""
+        connection = connection or self.get_connection()
+        key_stats: KeyStats = KeyStats()
+        row = connection.execute(
+            "SELECT data FROM key_stats WHERE username = ?", (username,)
+        ).fetchone()
+        if row is not None:
+            try:
+                key_stats.load(row[0])
+            except (ValueError, zlib.error) as e:
+                print(e)  # Incompatible stats start again from zero
+        return key_stats
+
+    def merge_key_stats(
+            self,
+            connection: sqlite3.Connection,
+            username: str,
+            key_stats: KeyStats
+    ) -> None:
+        """
+        Add the key stats (e.g. of a test) to the user's ones, the caller
+        commits the transaction
+        """
+        stored: KeyStats = self.get_key_stats(username, connection)
+        stored.merge(key_stats)
+        connection.execute(
+            "INSERT OR REPLACE INTO key_stats (username, data) VALUES (?, ?)",
+            (username, stored.to_bytes())
+        )
+        return None
+
+    def update_scores(self, connection: sqlite3.Connection, rows) -> int:
+        """
+        Replace the scores of the results of the recordings in a single
+        transaction, the rows are (recording, results) pairs. Return how
+        many results were updated
+        """
+        with connection:
+            cursor = connection.executemany(
+                "UPDATE results SET wpm = ?, raw_wpm = ?, accuracy = ?, "
+                "consistency = ?, correct = ?, incorrect = ? "
+                "WHERE recording = ?",
+                (
+                    (
+                        results.get("wpm"), results.get("raw_wpm"),
+                        results.get("accuracy"), results.get("consistency"),
+                        results.get("correct"), results.get("incorrect"),
+                        recording
+                    )
+                    for recording, results in rows
+                )
+            )
+        return cursor.rowcount
+
+    def get_summary(self, username: str) -> dict:
+        """
+        Return the best and average wpm of the user per test duration:
+        {seconds: (best, average)}, endless tests are under 0 seconds
+        """
+        rows = self.get_connection().execute(
+            "SELECT seconds, MAX(wpm), AVG(wpm) FROM results "
+            "WHERE username = ? GROUP BY seconds",
+            (username,)
+        )
+        return {seconds: (best, average) for seconds, best, average in rows}
+
+    def get_history(
+            self, username: str, before: float = None, limit: int = 50
+    ) -> list:
+        """
+        Return a page of the user's results, newest first, created before
+        the received timestamp (the 'created_at' of the last row of the
+        previous page)
+        """
+        if before is None:
+            before = float("inf")
+        return self.get_connection().execute(
+            "SELECT created_at, seconds, elapsed, language, wpm, accuracy "
+            "FROM results WHERE username = ? AND created_at < ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (username, before, limit)
+        ).fetchall()
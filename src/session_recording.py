@@ -0,0 +1,275 @@
+from os import makedirs
+from os.path import abspath, dirname, join, relpath
+from typing import Iterator, NamedTuple
+import mmap
+import time
+
+# Recordings of every test, in a directory for each month
+RECORDINGS_DIRECTORY: str = join(dirname(abspath(__file__)), "recordings")
+RECORDING_SUFFIX: str = ".tsr"
+RECORDING_MAGIC: bytes = b"TSRC"
+RECORDING_VERSION: int = 1
+# Options of the header flags
+SPECIALS: int = 1
+NUMBERS: int = 2
+FREQUENCY_WORDS: int = 4
+ADAPTIVE: int = 8
+# Kind of every record, kept in the two lowest bits of its first varint
+# together with the microseconds since the previous record
+KEY_CORRECT: int = 0  # Nothing else, the key was the expected character
+KEY_WRONG: int = 1  # Followed by the code point of the typed character
+LINE: int = 2  # Followed by the bytes of a line added to the text
+END: int = 3  # The test finished, nothing else
+
+
+class KeyEvent(NamedTuple):
+    offset_ns: int  # Since the start of the test
+    expected: str
+    typed: str
+    correct: bool
+
+
+def encode_varint(value: int, buffer: bytearray) -> None:
+    """Append the unsigned value to the buffer as a LEB128 varint"""
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+    return None
+
+
+def decode_varint(data, position: int) -> tuple:
+    """Return the varint at the position and the position after it"""
+    value: int = 0
+    shift: int = 0
+    while True:
+        byte: int = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def encode_text(text: str, buffer: bytearray) -> None:
+    """Append the text to the buffer, prefixed by its length in bytes"""
+    raw: bytes = text.encode("utf-8")
+    encode_varint(len(raw), buffer)
+    buffer += raw
+    return None
+
+
+def decode_text(data, position: int) -> tuple:
+    """
+    Return the text at the position and the position after it, raising
+    IndexError if the data ends before it
+    """
+    size, position = decode_varint(data, position)
+    end: int = position + size
+    if end > len(data):
+        raise IndexError("The text is cut")
+    return data[position:end].decode("utf-8"), end
+
+
+def get_recording_path(created_at: float = None) -> str:
+    """Return a new path for a recording, in the directory of its month"""
+    created_at = time.time() if created_at is None else created_at
+    month: str = time.strftime("%Y-%m", time.localtime(created_at))
+    name: str = f"{int(created_at * 1_000_000)}{RECORDING_SUFFIX}"
+    return join(RECORDINGS_DIRECTORY, month, name)
+
+
+def get_recording_name(file_name: str) -> str:
+    """Return the path of the recording inside the recordings directory"""
+    return relpath(file_name, RECORDINGS_DIRECTORY).replace("\\", "/")
+
+
+class RecordingWriter:
+    def __init__(
+            self,
+            file_name: str,
+            language: str,
+            seconds: int,
+            seed: int,
+            username: str = "",
+            flags: int = 0,
+            created_at: float = None
+    ):
+        # Records are encoded into a small buffer that is written to the
+        # (buffered) file when it grows, so a key only appends a few bytes.
+        # The file is created by 'open', not here, so a test can be started
+        # without file I/O and the file opened right after
+        self.file_name: str = file_name
+        self.file = None
+        self.failed: bool = False  # The file couldn't be written
+        self.buffer: bytearray = bytearray(RECORDING_MAGIC)
+        self.buffer.append(RECORDING_VERSION)
+        self.buffer.append(flags)
+        encode_varint(seconds, self.buffer)
+        encode_varint(seed, self.buffer)
+        created_at = time.time() if created_at is None else created_at
+        encode_varint(int(created_at * 1000), self.buffer)
+        encode_text(language, self.buffer)
+        encode_text(username, self.buffer)
+        self.flush_size: int = 4096
+        self.start_ns: int = 0
+        self.last_us: int = 0  # Microseconds of the last record
+        self.closed: bool = False
+
+    def open(self) -> None:
+        """Create the file (and its month directory) if it isn't open"""
+        if self.file is not None or self.failed:
+            return None
+        try:
+            makedirs(dirname(self.file_name) or ".", exist_ok=True)
+            self.file = open(file=self.file_name, mode="wb")
+        except OSError as e:
+            print(e)  # The test goes on without being recorded
+            self.failed = True
+        return None
+
+    def start(self, start_ns: int) -> None:
+        """Set the start of the test, the records follow it"""
+        self.start_ns = start_ns
+        self.last_us = 0
+        return None
+
+    def get_delta(self, now_ns: int) -> int:
+        """Return the microseconds since the last record, moving it"""
+        now_us: int = (now_ns - self.start_ns) // 1000
+        delta: int = max(0, now_us - self.last_us)
+        self.last_us += delta
+        return delta
+
+    def write_key(self, now_ns: int, typed: str, correct: bool) -> None:
+        """
+        Record a typed key. An empty typed character (e.g. dead keys) is
+        saved as 0, like in the keystroke log
+        """
+        delta: int = self.get_delta(now_ns)
+        if correct:
+            encode_varint(delta << 2 | KEY_CORRECT, self.buffer)
+        else:
+            encode_varint(delta << 2 | KEY_WRONG, self.buffer)
+            encode_varint(ord(typed[0]) if typed else 0, self.buffer)
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+        return None
+
+    def write_line(self, line: str) -> None:
+        """Record a line added to the text, its keys come after it"""
+        encode_varint(LINE, self.buffer)
+        encode_text(line, self.buffer)
+        return None
+
+    def flush(self) -> None:
+        """Write the buffered records to the file, opening it if needed"""
+        self.open()
+        if not self.failed:
+            try:
+                self.file.write(self.buffer)
+            except OSError as e:
+                print(e)
+                self.failed = True
+        self.buffer.clear()
+        return None
+
+    def finish(self, now_ns: int) -> None:
+        """Record the end of the test and close the file"""
+        if not self.closed:
+            encode_varint(self.get_delta(now_ns) << 2 | END, self.buffer)
+            self.close()
+        return None
+
+    def close(self) -> None:
+        """
+        Close the file, without an end record if the test didn't finish
+        (the recording is kept, but it's marked as incomplete)
+        """
+        if not self.closed:
+            self.flush()
+            if self.file is not None:
+                self.file.close()
+            self.closed = True
+        return None
+
+
+class RecordingReader:
+    def __init__(self, file_name: str):
+        # The file is memory mapped and its records are decoded while they
+        # are iterated, the header is read right away
+        self.file_name: str = file_name
+        with open(file=file_name, mode="rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if (
+                    self.map[:4] != RECORDING_MAGIC
+                    or self.map[4] != RECORDING_VERSION
+            ):
+                raise ValueError(f"{file_name} isn't a session recording")
+            self.flags: int = self.map[5]
+            position: int = 6
+            self.seconds, position = decode_varint(self.map, position)
+            self.seed, position = decode_varint(self.map, position)
+            created_at, position = decode_varint(self.map, position)
+            self.created_at: float = created_at / 1000
+            self.language, position = decode_text(self.map, position)
+            self.username, position = decode_text(self.map, position)
+        except (IndexError, UnicodeDecodeError) as e:
+            self.close()
+            raise ValueError(f"{file_name} has a broken header") from e
+        except ValueError:
+            self.close()
+            raise
+        self.records_start: int = position
+        self.lines: list = []  # Lines of the text, filled while iterating
+        self.elapsed_ns: int = None  # Set by the end record, if there's one
+
+    def __iter__(self) -> Iterator[KeyEvent]:
+        """
+        Yield every key of the recording, as the typing session scores
+        them: each key is compared with the next character of the text,
+        going to the next line when one is finished
+        """
+        data = self.map
+        size: int = len(data)
+        position: int = self.records_start
+        now_us: int = 0
+        line_idx: int = 0
+        char_idx: int = 0
+        self.lines = []
+        try:
+            while position < size:
+                value, position = decode_varint(data, position)
+                kind: int = value & 3
+                now_us += value >> 2
+                if kind == LINE:
+                    line, position = decode_text(data, position)
+                    self.lines.append(line)
+                    continue
+                if kind == END:
+                    self.elapsed_ns = now_us * 1000
+                    return
+                expected: str = self.lines[line_idx][char_idx]
+                if kind == KEY_WRONG:
+                    code, position = decode_varint(data, position)
+                    typed: str = chr(code) if code else ""
+                else:
+                    typed: str = expected
+                char_idx += 1
+                if char_idx == len(self.lines[line_idx]):
+                    line_idx += 1
+                    char_idx = 0
+                yield KeyEvent(now_us * 1000, expected, typed, kind == 0)
+        except (IndexError, UnicodeDecodeError):
+            return  # The last record was cut, the test didn't finish
+
+    @property
+    def complete(self) -> bool:
+        """Return if the test finished (only known after iterating)"""
+        return self.elapsed_ns is not None
+
+    def close(self) -> None:
+        """Close the memory map"""
+        self.map.close()
+        return None
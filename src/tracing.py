@@ -0,0 +1,120 @@
+from array import array
+from functools import wraps
+from itertools import count
+from json import dump
+from os import environ, getpid
+from threading import get_ident
+from time import perf_counter_ns
+from typing import Callable
+import atexit
+
+# File of the trace, tracing is on if it's set (or with main's --trace)
+TRACE_VARIABLE: str = "TYPING_SPEED_TRACE"
+TRACE_CAPACITY: int = 100_000  # Spans kept, the oldest are overwritten
+
+
+class Tracer:
+    def __init__(self, file_name: str, capacity: int = TRACE_CAPACITY):
+        # Columns of the spans, preallocated so a span only stores numbers:
+        # its name and thread ids, start (perf_counter_ns) and duration
+        self.file_name: str = file_name
+        self.capacity: int = capacity
+        self.name_ids: array = array("H", [0]) * capacity
+        self.thread_ids: array = array("H", [0]) * capacity
+        self.starts: array = array("q", [0]) * capacity
+        self.durations: array = array("q", [0]) * capacity
+        self.names: list = []
+        self.threads: dict = {}  # {thread ident: thread id}
+        self.counter = count()  # next() is atomic, threads can add spans
+        self.origin: int = perf_counter_ns()
+
+    def get_name_id(self, name: str) -> int:
+        """Return the id of the span name, adding it if it's new"""
+        if name not in self.names:
+            self.names.append(name)
+        return self.names.index(name)
+
+    def add(self, name_id: int, start: int, end: int) -> None:
+        """Store a finished span"""
+        idx: int = next(self.counter) % self.capacity
+        ident: int = get_ident()
+        thread_id: int = self.threads.get(ident)
+        if thread_id is None:
+            thread_id = self.threads.setdefault(ident, len(self.threads))
+        self.name_ids[idx] = name_id
+        self.thread_ids[idx] = thread_id
+        self.starts[idx] = start
+        self.durations[idx] = end - start
+        return None
+
+    def get_events(self) -> list:
+        """Return the stored spans as Chrome trace events, oldest first"""
+        total: int = next(self.counter)
+        self.counter = count(total)  # Taking the total didn't add a span
+        first: int = max(0, total - self.capacity)
+        pid: int = getpid()
+        events: list = []
+        for position in range(first, total):
+            idx: int = position % self.capacity
+            events.append({
+                "name": self.names[self.name_ids[idx]],
+                "ph": "X",  # A complete event, with its duration
+                "ts": (self.starts[idx] - self.origin) / 1000,
+                "dur": self.durations[idx] / 1000,
+                "pid": pid,
+                "tid": self.thread_ids[idx]
+            })
+        return events
+
+    def dump(self) -> None:
+        """Write the spans to the file (Chrome trace event format)"""
+        try:
+            with open(file=self.file_name, mode="w") as file:
+                dump(
+                    {"traceEvents": self.get_events(),
+                     "displayTimeUnit": "ms"},
+                    file
+                )
+        except OSError as e:
+            print(e)
+        return None
+
+
+tracer: Tracer = None
+
+
+def enable(file_name: str) -> None:
+    """
+    Start tracing into the file, which is written when the app exits.
+    Only the functions decorated after this are traced
+    """
+    global tracer
+    if tracer is None:
+        tracer = Tracer(file_name)
+        atexit.register(tracer.dump)
+    return None
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorate a function to record a span for every call. If tracing is
+    off the function is returned as it is, so it costs nothing
+    """
+    def decorate(function: Callable) -> Callable:
+        if tracer is None:
+            return function
+        name_id: int = tracer.get_name_id(name)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start: int = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                tracer.add(name_id, start, perf_counter_ns())
+        return wrapper
+    return decorate
+
+
+if environ.get(TRACE_VARIABLE):
+    enable(environ[TRACE_VARIABLE])
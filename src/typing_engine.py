@@ -0,0 +1,234 @@
+from collections import deque
+from math import ceil
+from random import Random
+from time import perf_counter_ns
+from typing import Callable
+from keystroke_log import KeystrokeLog
+from results_engine import compute_results
+from session_recording import RecordingWriter
+from tracing import traced
+from word_sampler import LengthSampler, get_sampler
+
+NS_PER_SECOND: int = 1_000_000_000
+
+
+class TextGenerator:
+    def __init__(
+            self,
+            words,
+            specials: tuple = (),
+            numbers: tuple = (),
+            max_chars: dict = None,
+            seed: int = None,
+            sampler: LengthSampler = None
+    ):
+        if not len(words):
+            raise ValueError("There are no words to create the text")
+        self.words = words  # A tuple or a PackCorpus, read by index
+        self.specials: tuple = specials  # Empty if they are disabled
+        self.numbers: tuple = numbers  # Empty if they are disabled
+        self.max_chars: dict = max_chars or {
+            "canvas": 40,
+            "specials": 2,
+            "numbers": 2
+        }
+        self.seed: int = seed
+        self.random: Random = Random(seed)
+        # Uniform by default, a WeightedSampler follows the word frequency
+        self.sampler: LengthSampler = sampler or get_sampler(words)
+
+    def get_random_word(self) -> str:
+        """Return a random word from the initialized list"""
+        return self.random.choice(self.words)
+
+    def get_randon_special(self) -> str:
+        """Return a random special character from the initialized list"""
+        return self.random.choice(self.specials)
+
+    def get_random_number(self) -> str:
+        """Return a random number from the initialized list"""
+        return self.random.choice(self.numbers)
+
+    @traced("TextGenerator.create_text_line")
+    def create_text_line(self) -> str:
+        """Return a line with random words to be displayed in the canvas"""
+        line: list = self.sampler.fill_line(
+            self.random, self.max_chars.get("canvas")
+        )
+        if self.specials and self.numbers:
+            counter: int = 0
+            line_length: int = len(line) - 1
+            while (
+                    counter < self.max_chars.get("specials")
+                    + self.max_chars.get("numbers")
+            ):
+                random_idx = self.random.randint(0, line_length)
+                if counter % 2 == 0:
+                    line[random_idx] = self.get_randon_special()
+                else:
+                    line[random_idx] = self.get_random_number()
+                counter += 1
+        elif self.specials:
+            counter: int = 0
+            line_length: int = len(line) - 1
+            while counter < self.max_chars.get("specials"):
+                random_idx = self.random.randint(0, line_length)
+                line[random_idx] = self.get_randon_special()
+                counter += 1
+        elif self.numbers:
+            counter: int = 0
+            line_length: int = len(line) - 1
+            while counter < self.max_chars.get("numbers"):
+                random_idx = self.random.randint(0, line_length)
+                line[random_idx] = self.get_random_number()
+                counter += 1
+        return " ".join(line)
+
+
+class LineStream:
+    def __init__(self, generator: TextGenerator, prefetch: int = 4):
+        self.generator: TextGenerator = generator
+        self.prefetch: int = prefetch  # Lines kept ready to be used
+        self.ready: deque = deque()
+
+    def fill(self) -> int:
+        """Generate lines until the prefetch queue is full, return how many"""
+        added: int = 0
+        while len(self.ready) < self.prefetch:
+            self.ready.append(self.generator.create_text_line())
+            added += 1
+        return added
+
+    def next_line(self) -> str:
+        """
+        Return the next ready line. If the queue is empty (it wasn't filled
+        in time) the line is generated right now
+        """
+        if self.ready:
+            return self.ready.popleft()
+        return self.generator.create_text_line()
+
+
+class TypingSession:
+    def __init__(
+            self,
+            generator: TextGenerator,
+            seconds: int,
+            visible_lines: int = 4,
+            clock: Callable[[], int] = perf_counter_ns,
+            recorder: RecordingWriter = None
+    ):
+        self.generator: TextGenerator = generator
+        self.stream: LineStream = LineStream(generator)
+        self.seconds: int = seconds  # 0 means an endless session
+        self.visible_lines: int = visible_lines
+        self.clock: Callable[[], int] = clock  # Returns nanoseconds
+        self.lines: list = []  # Visible lines, the user types the first one
+        self.char_idx: int = 0  # Position of the next character to type
+        self.line_number: int = 1  # Lines started since the beginning
+        self.text_counter: list = [0, 0]  # [correct, incorrect]
+        self.keystroke_log: KeystrokeLog = KeystrokeLog(
+            max(6000, seconds * 50)
+        )
+        self.start_ns: int = 0
+        self.finished: bool = False
+        self.recorder: RecordingWriter = recorder  # Optional, see 'record'
+
+    def start(self, now_ns: int = None) -> None:
+        """Generate the first lines and start counting the time"""
+        self.lines = [
+            self.stream.next_line() for _ in range(self.visible_lines)
+        ]
+        self.stream.fill()
+        self.char_idx = 0
+        self.line_number = 1
+        self.text_counter = [0, 0]
+        self.keystroke_log.clear()
+        self.finished = False
+        self.start_ns = self.clock() if now_ns is None else now_ns
+        if self.recorder is not None:
+            self.recorder.start(self.start_ns)
+            for line in self.lines:
+                self.recorder.write_line(line)
+        return None
+
+    def current_char(self) -> str:
+        """Return the character the user has to type next"""
+        return self.lines[0][self.char_idx]
+
+    def feed_key(self, char: str, now_ns: int = None) -> tuple:
+        """
+        Score the typed character against the next one and move forward.
+        Return a tuple: (is_correct, line_finished). When the first line
+        is finished it's dropped and a new one is added at the end
+        """
+        expected: str = self.lines[0][self.char_idx]
+        correct: bool = char == expected
+        now_ns = self.clock() if now_ns is None else now_ns
+        self.text_counter[0 if correct else 1] += 1
+        self.keystroke_log.append(now_ns, expected, char, correct)
+        if self.recorder is not None:
+            self.recorder.write_key(now_ns, char, correct)
+        self.char_idx += 1
+        if self.char_idx < len(self.lines[0]):
+            return correct, False
+        self.lines.pop(0)
+        self.lines.append(self.stream.next_line())
+        if self.recorder is not None:
+            self.recorder.write_line(self.lines[-1])
+        self.char_idx = 0
+        self.line_number += 1
+        return correct, True
+
+    def tick(self, now_ns: int = None) -> float:
+        """
+        Return the seconds left, finishing the session when they end.
+        Endless sessions always return infinity
+        """
+        if not self.seconds:
+            return float("inf")
+        now_ns = self.clock() if now_ns is None else now_ns
+        elapsed: float = (now_ns - self.start_ns) / NS_PER_SECOND
+        if elapsed >= self.seconds:
+            self.finished = True
+            return 0.0
+        return self.seconds - elapsed
+
+    def get_elapsed(self, now_ns: int = None) -> int:
+        """Return the whole seconds the session lasted (endless ones too)"""
+        if self.seconds:
+            return self.seconds
+        now_ns = self.clock() if now_ns is None else now_ns
+        return max(1, ceil((now_ns - self.start_ns) / NS_PER_SECOND))
+
+    def finish_recording(self, now_ns: int = None) -> None:
+        """
+        Record the end of the session and close the recording. A timed
+        session ends when its time is over, even if it's closed later
+        """
+        if self.recorder is not None:
+            now_ns = self.clock() if now_ns is None else now_ns
+            if self.seconds:
+                now_ns = min(
+                    now_ns, self.start_ns + self.seconds * NS_PER_SECOND
+                )
+            self.recorder.finish(now_ns)
+        return None
+
+    def results(self, now_ns: int = None) -> dict:
+        """
+        Return the results of the session, see 'compute_results', and if
+        it was endless ('seconds' is the time it lasted). The counters are
+        used for the totals, since the log only keeps the last keys of
+        very long sessions
+        """
+        timestamps, _, _, correct = self.keystroke_log.get_columns()
+        series_start_ns: int = self.start_ns
+        if len(self.keystroke_log) == self.keystroke_log.capacity:
+            series_start_ns = timestamps[0]  # The first keys were dropped
+        results: dict = compute_results(
+            timestamps, correct, self.start_ns, self.get_elapsed(now_ns),
+            totals=tuple(self.text_counter), series_start_ns=series_start_ns
+        )
+        results["endless"] = not self.seconds
+        return results
@@ -1,11 +1,23 @@
 from tkinter import Tk, Frame
 from importlib import import_module
 from typing import cast
+from collections import OrderedDict
+from threading import Thread
+import time
+from language_packs import LanguageRegistry
+from tracing import traced
+from word_pool import WordPool
 
 
 class UI:
-    def __init__(self, root: Tk):
+    def __init__(
+            self, root: Tk, started: float = None, profile: bool = False
+    ):
         self.root: Tk = root
+        # [(stage, perf_counter)] of the startup, printed if profile is set
+        self.startup_times: list = [("start", started or time.perf_counter())]
+        self.profile_startup: bool = profile
+        self.mark_startup("imports_and_root")
         self.styles: dict = {
             "background_color": "#CCCCCC",
             "button_font": ("Segoe UI", 20, "normal"),
@@ -19,17 +31,98 @@ class UI:
             "canvas_guide_font": ("Segoe UI", 40, "italic"),
             "guide_font_color": "#50a5ff"
         }
-        self.screen_width: int = self.get_window_size()[0]
-        self.screen_height: int = self.get_window_size()[1]
+        self.screen_width, self.screen_height = self.get_window_size()
         self.current_frame: Frame = cast(Frame, None)
+        self.frames: OrderedDict = OrderedDict()  # {class_name: frame}, LRU
+        self.frame_cache_size: int = 4  # Built frames kept alive
+        self.switch_times: list = []  # [(class_name, built, milliseconds)]
         self.modules: dict = {
             "MainUI": "main_ui",
             "ProfileUI": "profile_ui",
             "LoginUI": "login_ui",
             "RegisterUI": "register_ui"
         }
+        # Languages found in the files directory, packs opened on selection
+        self.language_packs: LanguageRegistry = LanguageRegistry()
+        self.default_language: str = "english"
+        self.word_pool: WordPool = WordPool()
+        self.frame_budget_ms: int = 16  # Time between two widget refreshes
+        self.services: dict = {}  # Built on first use, see 'get_service'
+        self.username: str = ""  # User logged in, empty if there isn't one
         self.configure_root()
+        self.mark_startup("configure_root")
+        # Paint the empty window first and build the login frame after it
+        self.root.update_idletasks()
+        self.mark_startup("first_paint")
+        self.root.after_idle(self.finish_startup)
+
+    def mark_startup(self, stage: str) -> None:
+        """Save the time when the startup stage finished"""
+        self.startup_times.append((stage, time.perf_counter()))
+        return None
+
+    def finish_startup(self) -> None:
+        """Build the login frame and preload the words in the background"""
         self.switch_frame("LoginUI")
+        self.mark_startup("login_frame")
+        Thread(target=self.preload_words, daemon=True).start()
+        return None
+
+    def preload_words(self) -> None:
+        """
+        Load the specials and numbers files and the default language pack
+        with its samplers (runs in its own thread), the other packs are
+        loaded when chosen
+        """
+        from word_sampler import prepare_samplers  # Off the startup path
+        try:
+            self.word_pool.preload()
+            prepare_samplers(self.language_packs.get(self.default_language))
+        except (OSError, ValueError) as e:
+            print(e)
+        self.mark_startup("preload_words")
+        if self.profile_startup:
+            self.print_startup()
+        return None
+
+    def print_startup(self) -> None:
+        """Print the time taken by every startup stage"""
+        start: float = self.startup_times[0][1]
+        previous: float = start
+        for stage, moment in self.startup_times[1:]:
+            print(f"{stage:<16}{(moment - previous) * 1000:>9.2f} ms"
+                  f"{(moment - start) * 1000:>11.2f} ms total")
+            previous = moment
+        return None
+
+    def get_service(self, module_name: str, class_name: str, *args):
+        """
+        Return the service built from the module's class, importing the
+        module and building it with the arguments the first time
+        """
+        service = self.services.get(module_name)
+        if service is None:
+            module = import_module(module_name)
+            service = getattr(module, class_name)(*args)
+            self.services[module_name] = service
+        return service
+
+    @property
+    def results_store(self):
+        """Return the results store (results_store.ResultsStore)"""
+        return self.get_service("results_store", "ResultsStore")
+
+    @property
+    def credential_store(self):
+        """Return the credential store (credential_store.CredentialStore)"""
+        return self.get_service("credential_store", "CredentialStore")
+
+    @property
+    def password_hasher(self):
+        """Return the password hasher (password_hasher.PasswordHasher)"""
+        return self.get_service(
+            "password_hasher", "PasswordHasher", self.root
+        )
 
     def get_window_size(self) -> tuple:
         """Returns the size of the user's window as a tuple: (width, height)"""
@@ -45,14 +138,13 @@ class UI:
         self.root.grid_columnconfigure(0, weight=1)
         return None
 
+    @traced("UI.switch_frame")
     def switch_frame(self, frameClassName: str) -> None:
         """
         Switch the current frame to the specified one,
         using the class name (str)
         """
-        if self.current_frame is not None:
-            self.current_frame.on_frame_deactivation()
-            self.current_frame.destroy()
+        start: float = time.perf_counter()
         if not isinstance(frameClassName, str):
             raise ValueError(
                 "The 'frameClassName' value is not a string"
@@ -62,16 +154,45 @@ class UI:
             raise ValueError(
                 "The class name does not exist or isn't valid"
             )
-        module = import_module(module_name)
-        module_class = getattr(module, frameClassName)
-        self.current_frame = module_class(self.root, self)
-        self.current_frame.on_frame_activation()
-        self.current_frame.grid(row=0, column=0, sticky="nsew")
-        self.current_frame.grid_propagate(False)
+        if self.current_frame is not None:
+            self.current_frame.on_frame_deactivation()
+            self.current_frame.grid_remove()
+        frame: Frame = self.frames.get(frameClassName)
+        built: bool = frame is None
+        if built:
+            module = import_module(module_name)
+            module_class = getattr(module, frameClassName)
+            frame = module_class(self.root, self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            frame.grid_propagate(False)
+            self.frames[frameClassName] = frame
+        else:
+            frame.grid()
+            self.frames.move_to_end(frameClassName)
+        self.current_frame = frame
+        frame.tkraise()
+        frame.on_frame_activation()
+        self.evict_frames()
         self.root.update_idletasks()
+        self.switch_times.append(
+            (frameClassName, built, (time.perf_counter() - start) * 1000)
+        )
+        return None
+
+    def evict_frames(self) -> None:
+        """Destroy the least recently used frames that don't fit the cache"""
+        while len(self.frames) > max(1, self.frame_cache_size):
+            _, frame = self.frames.popitem(last=False)
+            frame.destroy()
         return None
 
     def keep_open(self) -> None:
-        """Calls the 'mainloop' function to keep open the main Tk window"""
+        """
+        Calls the 'mainloop' function to keep open the main Tk window.
+        When it's closed, the queued results are saved before exiting
+        """
         self.root.mainloop()
+        results_store = self.services.get("results_store")
+        if results_store is not None:
+            results_store.wait_writes()
         return None
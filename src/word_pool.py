@@ -0,0 +1,67 @@
+from os import stat
+from os.path import abspath, dirname, join
+
+# The files directory of the project, wherever it's run from
+FILES_DIRECTORY: str = join(dirname(dirname(abspath(__file__))), "files")
+
+
+class WordPool:
+    def __init__(self, directory: str = FILES_DIRECTORY):
+        self.directory: str = directory
+        # {file_name: (modification_time, words)}
+        self.cache: dict = {}
+
+    def get_path(self, file_name: str) -> str:
+        """Return the path of the received file inside the pool directory"""
+        return join(self.directory, file_name)
+
+    def read_file(self, file_name: str) -> tuple:
+        """Read a file where each line has only one word and return them"""
+        with open(file=self.get_path(file_name), mode="r") as file:
+            words: tuple = tuple(
+                line.rstrip("\n") for line in file if line.strip()
+            )
+        return words
+
+    def load(self, file_name: str) -> tuple:
+        """
+        Load the file into the cache if it isn't there or if it changed
+        since it was read, and return its words
+        """
+        mtime: float = stat(self.get_path(file_name)).st_mtime
+        cached = self.cache.get(file_name)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self.read_file(file_name))
+            self.cache[file_name] = cached
+        return cached[1]
+
+    def get(self, file_name: str) -> tuple:
+        """Return the cached words of the file, loading it only if missing"""
+        cached = self.cache.get(file_name)
+        if cached is None:
+            return self.load(file_name)
+        return cached[1]
+
+    def get_specials(self) -> tuple:
+        """Return the special characters"""
+        return self.get("specials_file.txt")
+
+    def get_numbers(self) -> tuple:
+        """Return the number characters"""
+        return self.get("numbers_file.txt")
+
+    def preload(self) -> None:
+        """Load the specials and numbers files into the cache"""
+        self.load("specials_file.txt")
+        self.load("numbers_file.txt")
+        return None
+
+    def refresh(self) -> None:
+        """Reload the cached files whose modification time has changed"""
+        for file_name in tuple(self.cache):
+            try:
+                self.load(file_name)
+            except FileNotFoundError as e:
+                print(e)
+                del self.cache[file_name]
+        return None
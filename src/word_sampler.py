@@ -0,0 +1,296 @@
+from array import array
+from bisect import bisect_right
+from random import Random
+from corpus import PackCorpus
+from key_stats import SLOTS, get_slot
+
+
+class LengthSampler:
+    def __init__(self, words):
+        # Words sorted by length, so the ones up to a length are a prefix.
+        # Packs are already sorted and stay in their file
+        self.weights = None  # Weight of every rank, only packs have them
+        if isinstance(words, PackCorpus):
+            self.words = words
+            self.lengths: array = words.lengths
+            self.ranks: array = words.ranks
+            self.weights = words.weights
+        else:
+            unique: tuple = tuple(dict.fromkeys(words))
+            order: list = sorted(
+                range(len(unique)), key=lambda idx: len(unique[idx])
+            )
+            self.words = tuple(unique[idx] for idx in order)
+            self.lengths: array = array("H", map(len, self.words))
+            self.ranks: array = array("I", order)  # Position in the file
+        longest: int = self.lengths[-1] if self.lengths else 0
+        self.fitting: list = [  # Words with a length up to the position
+            bisect_right(self.lengths, length) for length in range(longest + 1)
+        ]
+
+    def count_fitting(self, max_length: int) -> int:
+        """Return how many words have a length up to the received one"""
+        if max_length < 0:
+            return 0
+        if max_length >= len(self.fitting):
+            return len(self.words)
+        return self.fitting[max_length]
+
+    def sample(self, random: Random, max_length: int, last_idx: int = None):
+        """
+        Return the index of a random word of up to max_length characters,
+        different to the last one, or None if there isn't any (constant
+        time). Only indexes are drawn, the words are read when needed
+        """
+        fitting: int = self.count_fitting(max_length)
+        if last_idx is not None and last_idx < fitting:
+            if fitting == 1:
+                return None
+            idx: int = random.randrange(fitting - 1)
+            if idx >= last_idx:
+                idx += 1  # Skip the last word without rejecting
+            return idx
+        if fitting == 0:
+            return None
+        return random.randrange(fitting)
+
+    def fill_line(self, random: Random, max_chars: int) -> list:
+        """
+        Return the words of a line whose characters (without the spaces)
+        are less than max_chars, never repeating a word twice in a row.
+        Every step adds a word or ends, so it takes at most max_chars steps.
+        The line is empty if there aren't any words
+        """
+        last_idx: int = self.sample(random, len(self.fitting))
+        if last_idx is None:
+            return []
+        line: list = [self.words[last_idx]]
+        line_length: int = self.lengths[last_idx]
+        while line_length < max_chars:
+            idx = self.sample(random, max_chars - line_length - 1, last_idx)
+            if idx is None:
+                break
+            line.append(self.words[idx])
+            line_length += self.lengths[idx]
+            last_idx = idx
+        return line
+
+
+class AliasTable:
+    def __init__(self, weights: list):
+        # Vose's alias method: each slot keeps a probability and an alias
+        count: int = len(weights)
+        total: float = sum(weights)
+        scaled: list = [weight * count / total for weight in weights]
+        self.probability: array = array("d", [1.0]) * count
+        self.alias: array = array("I", range(count))
+        small: list = [idx for idx, value in enumerate(scaled) if value < 1]
+        large: list = [idx for idx, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def sample(self, random: Random) -> int:
+        """Return a random index following the weights (constant time)"""
+        idx: int = int(random.random() * len(self.alias))
+        if random.random() < self.probability[idx]:
+            return idx
+        return self.alias[idx]
+
+
+class WeightedSampler(LengthSampler):
+    def __init__(self, words, weights: list = None):
+        # The weights follow the position of the (unique) words in the file,
+        # without them the ones of the pack or Zipf weights are used, as the
+        # files are ordered by frequency
+        super().__init__(words)
+        weights = self.weights if weights is None else weights
+        # Start position of every length bucket in the sorted words
+        self.bucket_starts: list = [
+            idx for idx, length in enumerate(self.lengths)
+            if idx == 0 or length != self.lengths[idx - 1]
+        ]
+        bucket_ends: list = self.bucket_starts[1:] + [len(self.words)]
+        bucket_weights: list = []
+        self.bucket_tables: list = []  # Alias table of each bucket's words
+        for start, end in zip(self.bucket_starts, bucket_ends):
+            ranks: array = self.ranks[start:end]
+            if weights is None:
+                table_weights: list = [1 / (rank + 1) for rank in ranks]
+            else:
+                table_weights: list = [weights[rank] for rank in ranks]
+            bucket_weights.append(sum(table_weights))
+            self.bucket_tables.append(AliasTable(table_weights))
+        # Alias table of the buckets up to each one (shorter lengths first)
+        self.prefix_tables: list = [
+            AliasTable(bucket_weights[:count])
+            for count in range(1, len(bucket_weights) + 1)
+        ]
+        self.bucket_fitting: list = [  # Buckets with a length up to the idx
+            sum(1 for start in self.bucket_starts
+                if self.lengths[start] <= length)
+            for length in range(len(self.fitting))
+        ]
+        self.tries: int = 4  # Weighted draws before the uniform fallback
+
+    def sample(self, random: Random, max_length: int, last_idx: int = None):
+        """
+        Return the index of a word of up to max_length characters following
+        the weights, different to the last one, or None if there isn't any.
+        It takes a bucket and a word from their alias tables, drawing again
+        if it's the last word, and falls back to the uniform sampler after a
+        few tries
+        """
+        if max_length < 0:
+            return None
+        if max_length >= len(self.bucket_fitting):
+            buckets: int = len(self.bucket_starts)
+        else:
+            buckets: int = self.bucket_fitting[max_length]
+        if buckets == 0:
+            return None
+        prefix: AliasTable = self.prefix_tables[buckets - 1]
+        for _ in range(self.tries):
+            bucket: int = prefix.sample(random)
+            idx: int = self.bucket_starts[bucket]
+            idx += self.bucket_tables[bucket].sample(random)
+            if idx != last_idx:
+                return idx
+        return super().sample(random, max_length, last_idx)
+
+
+class AdaptiveSampler(LengthSampler):
+    def __init__(
+            self,
+            sampler: LengthSampler,
+            index: dict,
+            weak_bigrams: list,
+            focus: float = 0.5
+    ):
+        # Shares the sorted words of the sampler instead of sorting them
+        # again, and draws from it the words that don't target a bigram
+        self.sampler: LengthSampler = sampler
+        self.words = sampler.words
+        self.lengths: array = sampler.lengths
+        self.ranks: array = sampler.ranks
+        self.weights = sampler.weights
+        self.fitting: list = sampler.fitting
+        self.focus: float = focus  # Chance of drawing a targeted word
+        weak_bigrams = [
+            (bigram, score) for bigram, score in weak_bigrams
+            if bigram in index
+        ]
+        # Words of every weak bigram (sorted, so the fitting ones are a
+        # prefix) and an alias table to pick a bigram by its score
+        self.targets: list = [index[bigram] for bigram, _ in weak_bigrams]
+        self.table: AliasTable = None
+        if weak_bigrams:
+            self.table = AliasTable([score for _, score in weak_bigrams])
+
+    def sample(self, random: Random, max_length: int, last_idx: int = None):
+        """
+        Return the index of a word of up to max_length characters,
+        different to the last one, or None if there isn't any. Some draws
+        (see 'focus') take a word with one of the weak bigrams, picking the
+        bigram by its score, the rest are left to the wrapped sampler
+        """
+        if self.table is not None and random.random() < self.focus:
+            targets: array = self.targets[self.table.sample(random)]
+            fitting: int = bisect_right(
+                targets, self.count_fitting(max_length) - 1
+            )
+            if fitting:
+                idx: int = targets[random.randrange(fitting)]
+                if idx != last_idx:
+                    return idx
+        return self.sampler.sample(random, max_length, last_idx)
+
+
+def build_bigram_index(words) -> dict:
+    """
+    Return the positions of the sampler's sorted words that contain every
+    bigram: {bigram slot: array of positions}, slots as in 'KeyStats'
+    """
+    index: dict = {}
+    for idx in range(len(words)):
+        word: str = words[idx]
+        bigrams: set = {
+            get_slot(ord(first)) * SLOTS + get_slot(ord(second))
+            for first, second in zip(word, word[1:])
+        }
+        for bigram in bigrams:
+            positions = index.get(bigram)
+            if positions is None:
+                positions = index[bigram] = array("I")
+            positions.append(idx)
+    return index
+
+
+samplers: dict = {}  # {(id(words), kind): (words, sampler)}
+MAX_SAMPLERS: int = 32
+
+
+def get_cached(words, kind: str, build):
+    """Return the cached sampler (or index) of the words, building it once"""
+    cached = samplers.get((id(words), kind))
+    if cached is None or cached[0] is not words:
+        if len(samplers) >= MAX_SAMPLERS:
+            samplers.clear()
+        cached = (words, build())
+        samplers[(id(words), kind)] = cached
+    return cached[1]
+
+
+def find_cached(words, kind: str):
+    """Return the cached sampler (or index) of the words, None if missing"""
+    cached = samplers.get((id(words), kind))
+    if cached is None or cached[0] is not words:
+        return None
+    return cached[1]
+
+
+def get_sampler(words) -> LengthSampler:
+    """Return the uniform sampler of the words, built only the first time"""
+    return get_cached(words, "uniform", lambda: LengthSampler(words))
+
+
+def get_weighted_sampler(words, weights: list = None) -> LengthSampler:
+    """
+    Return the frequency weighted sampler of the words, built only the
+    first time. Without weights, the ones of the pack or the position of
+    the words are used
+    """
+    return get_cached(
+        words, "weighted", lambda: WeightedSampler(words, weights)
+    )
+
+
+def prepare_samplers(words) -> None:
+    """
+    Build the uniform and weighted samplers of the words ahead of a test,
+    so starting it doesn't build them (e.g. in a loading thread)
+    """
+    get_sampler(words)
+    get_weighted_sampler(words)
+    return None
+
+
+def find_bigram_index(words) -> dict:
+    """Return the bigram index of the words if it's built, None if not"""
+    return find_cached(words, "bigrams")
+
+
+def get_bigram_index(words) -> dict:
+    """
+    Return the bigram index of the words (see 'build_bigram_index'),
+    built only the first time. The positions are the ones of the sampler
+    """
+    return get_cached(
+        words, "bigrams", lambda: build_bigram_index(get_sampler(words).words)
+    )
@@ -0,0 +1,116 @@
+"""
+Tests of the credential store (src/credential_store.py): the snapshot and
+its journal, shared by several instances of the app.
+Run them from the project directory:
+    python3 -m pytest tests
+"""
+from multiprocessing import get_context
+from os.path import dirname, exists, join
+from tempfile import TemporaryDirectory
+import json
+import sys
+import unittest
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from credential_store import CredentialStore  # noqa: E402
+
+
+def add_users(file_name: str, worker: int, count: int) -> None:
+    """Add users from another process, as another app instance would"""
+    store: CredentialStore = CredentialStore(file_name, compact_after=7)
+    for idx in range(count):
+        store.add_user(f"{worker}-{idx}@mail", f"{worker}-{idx}", "hash")
+    return None
+
+
+class CredentialStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.file_name: str = join(self.directory.name, "users.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_store(self, compact_after: int = 100) -> CredentialStore:
+        return CredentialStore(self.file_name, compact_after)
+
+    def read_journal(self) -> bytes:
+        with open(file=f"{self.file_name}.journal", mode="rb") as journal:
+            return journal.read()
+
+    def test_users_are_appended_to_the_journal(self):
+        store: CredentialStore = self.create_store()
+        store.add_user("ana@mail", "ana", "hash1")
+        store.add_user("bob@mail", "bob", "hash2")
+        self.assertFalse(exists(self.file_name))  # No snapshot yet
+        self.assertEqual(len(self.read_journal().splitlines()), 2)
+        other: CredentialStore = self.create_store()
+        self.assertEqual(other.get_user("ana")["password"], "hash1")
+        self.assertEqual(other.get_username("bob@mail"), "bob")
+        self.assertEqual(len(other), 2)
+
+    def test_duplicate_username_is_rejected(self):
+        store: CredentialStore = self.create_store()
+        store.add_user("ana@mail", "ana", "hash1")
+        with self.assertRaises(ValueError):
+            self.create_store().add_user("other@mail", "ana", "hash2")
+        self.assertEqual(store.get_user("ana")["email"], "ana@mail")
+        self.assertEqual(len(self.read_journal().splitlines()), 1)
+
+    def test_password_update_replaces_the_previous_one(self):
+        store: CredentialStore = self.create_store()
+        store.add_user("ana@mail", "ana", "old")
+        store.update_password("ana", "new")
+        credentials: dict = self.create_store().get_user("ana")
+        self.assertEqual(credentials["password"], "new")
+        with self.assertRaises(ValueError):
+            store.update_password("nobody", "new")
+
+    def test_partial_line_is_ignored_and_overwritten(self):
+        store: CredentialStore = self.create_store()
+        store.add_user("ana@mail", "ana", "hash1")
+        with open(file=f"{self.file_name}.journal", mode="ab") as journal:
+            journal.write(b'{"email": "cut@mail", "usern')  # Interrupted
+        other: CredentialStore = self.create_store()
+        self.assertEqual(len(other), 1)
+        other.add_user("bob@mail", "bob", "hash2")
+        lines: list = self.read_journal().splitlines()
+        self.assertEqual([json.loads(line)["username"] for line in lines],
+                         ["ana", "bob"])
+        self.assertEqual(len(self.create_store()), 2)
+
+    def test_compaction_moves_the_journal_to_the_snapshot(self):
+        store: CredentialStore = self.create_store(compact_after=3)
+        reader: CredentialStore = self.create_store()
+        self.assertEqual(len(reader), 0)
+        for idx in range(3):
+            store.add_user(f"{idx}@mail", f"user{idx}", "hash")
+        self.assertEqual(self.read_journal(), b"")
+        with open(file=self.file_name, mode="r") as snapshot:
+            users: list = json.load(snapshot)["users"]
+        self.assertEqual(len(users), 3)
+        store.add_user("3@mail", "user3", "hash")
+        # The reader loaded the journal before, it must notice the compaction
+        self.assertEqual(len(reader), 4)
+        self.assertEqual(len(self.create_store()), 4)
+
+    def test_concurrent_instances_keep_every_user(self):
+        context = get_context()
+        workers: list = [
+            context.Process(target=add_users, args=(self.file_name, idx, 20))
+            for idx in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            self.assertEqual(worker.exitcode, 0)
+        store: CredentialStore = self.create_store()
+        self.assertEqual(len(store), 80)
+        for idx in range(4):
+            self.assertIsNotNone(store.get_user(f"{idx}-19"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests of scoring the recordings again (src/rescore.py).
+Run them from the project directory:
+    python3 -m pytest tests
+"""
+from os.path import dirname, join
+from tempfile import TemporaryDirectory
+import sys
+import unittest
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from rescore import score_chunk, score_recording  # noqa: E402
+from session_recording import RecordingWriter  # noqa: E402
+
+MS: int = 1_000_000  # Nanoseconds
+
+
+def write_recording(file_name: str, line: str, finish: bool = True) -> None:
+    """Record the line typed correctly, one key every 100 ms"""
+    writer: RecordingWriter = RecordingWriter(file_name, "spanish", 0, 1)
+    writer.start(0)
+    writer.write_line(line)
+    for idx, char in enumerate(line):
+        writer.write_key((idx + 1) * 100 * MS, char, True)
+    if finish:
+        writer.finish((len(line) + 1) * 100 * MS)
+    else:
+        writer.close()
+    return None
+
+
+class ScoreRecordingTest(unittest.TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.file_name: str = join(self.directory.name, "test.tsr")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_scores_a_finished_recording(self):
+        write_recording(self.file_name, "año niño")
+        results: dict = score_recording(self.file_name)
+        self.assertEqual(results["correct"], 8)
+        self.assertEqual(results["incorrect"], 0)
+
+    def test_unfinished_recording_is_skipped(self):
+        write_recording(self.file_name, "año niño", finish=False)
+        self.assertIsNone(score_recording(self.file_name))
+
+    def test_recording_cut_inside_a_character_is_skipped(self):
+        write_recording(self.file_name, "ñ")
+        with open(file=self.file_name, mode="rb") as file:
+            data: bytes = file.read()
+        cut: int = data.index("ñ".encode("utf-8")) + 1  # Half of the ñ
+        for end in (cut, len(data) - 1):
+            with open(file=self.file_name, mode="wb") as file:
+                file.write(data[:end])
+            self.assertIsNone(score_recording(self.file_name))
+
+    def test_chunk_keeps_going_after_a_broken_recording(self):
+        write_recording(join(self.directory.name, "a.tsr"), "ñu")
+        with open(file=join(self.directory.name, "a.tsr"), mode="rb") as file:
+            data: bytes = file.read()
+        with open(file=join(self.directory.name, "a.tsr"), mode="wb") as file:
+            file.write(data[:data.index("ñ".encode("utf-8")) + 1])
+        write_recording(join(self.directory.name, "b.tsr"), "ñu")
+        rows: list = score_chunk(self.directory.name, ["a.tsr", "b.tsr"])
+        self.assertEqual([recording for recording, _ in rows], ["b.tsr"])
+
+
+if __name__ == "__main__":
+    unittest.main()
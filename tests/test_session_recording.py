@@ -0,0 +1,160 @@
+"""
+Tests of the session recording format (src/session_recording.py): what is
+written is read back the same, and cut or foreign files are handled.
+Run them from the project directory:
+    python3 -m pytest tests
+"""
+from os.path import dirname, join
+from tempfile import TemporaryDirectory
+import sys
+import unittest
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+from session_recording import KeyEvent, NUMBERS, SPECIALS  # noqa: E402
+from session_recording import RecordingReader, RecordingWriter  # noqa: E402
+from session_recording import decode_text, decode_varint  # noqa: E402
+from session_recording import encode_text, encode_varint  # noqa: E402
+
+MS: int = 1_000_000  # Nanoseconds
+
+
+class EncodingTest(unittest.TestCase):
+    def test_varints_round_trip(self):
+        values: list = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 35]
+        buffer: bytearray = bytearray()
+        for value in values:
+            encode_varint(value, buffer)
+        position: int = 0
+        for value in values:
+            decoded, position = decode_varint(buffer, position)
+            self.assertEqual(decoded, value)
+        self.assertEqual(position, len(buffer))
+
+    def test_varint_sizes(self):
+        for value, size in ((0, 1), (127, 1), (128, 2), (16384, 3)):
+            buffer: bytearray = bytearray()
+            encode_varint(value, buffer)
+            self.assertEqual(len(buffer), size)
+
+    def test_text_round_trip(self):
+        buffer: bytearray = bytearray()
+        for text in ("", "hello", "año 🙂"):
+            encode_text(text, buffer)
+        position: int = 0
+        for text in ("", "hello", "año 🙂"):
+            decoded, position = decode_text(buffer, position)
+            self.assertEqual(decoded, text)
+
+    def test_cut_text_raises_index_error(self):
+        buffer: bytearray = bytearray()
+        encode_text("hello", buffer)
+        with self.assertRaises(IndexError):
+            decode_text(buffer[:-1], 0)
+
+
+class RecordingTest(unittest.TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.file_name: str = join(self.directory.name, "month", "test.tsr")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, finish: bool = True) -> None:
+        """
+        Record two lines: 'añ' typed correctly, then 'b c' with a wrong
+        key, a key without a character (e.g. a dead key) and a right one
+        """
+        writer: RecordingWriter = RecordingWriter(
+            self.file_name, "spanish", 30, 1234, "user", SPECIALS | NUMBERS,
+            created_at=1_700_000_000.5
+        )
+        writer.start(10 * MS)
+        writer.write_line("añ")
+        writer.write_key(110 * MS, "a", True)
+        writer.write_key(260 * MS, "ñ", True)
+        writer.write_line("b c")
+        writer.write_key(400 * MS, "x", False)
+        writer.write_key(500 * MS, "", False)
+        writer.write_key(600 * MS, "c", True)
+        if finish:
+            writer.finish(30_010 * MS)
+        else:
+            writer.close()
+        return None
+
+    def read(self) -> tuple:
+        """Return the reader of the recording and its keys"""
+        reader: RecordingReader = RecordingReader(self.file_name)
+        self.addCleanup(reader.close)
+        return reader, list(reader)
+
+    def test_header_round_trip(self):
+        self.write()
+        reader, _ = self.read()
+        self.assertEqual(reader.language, "spanish")
+        self.assertEqual(reader.username, "user")
+        self.assertEqual(reader.seconds, 30)
+        self.assertEqual(reader.seed, 1234)
+        self.assertEqual(reader.flags, SPECIALS | NUMBERS)
+        self.assertEqual(reader.created_at, 1_700_000_000.5)
+
+    def test_keys_round_trip(self):
+        self.write()
+        reader, events = self.read()
+        self.assertEqual(events, [
+            KeyEvent(100 * MS, "a", "a", True),
+            KeyEvent(250 * MS, "ñ", "ñ", True),
+            KeyEvent(390 * MS, "b", "x", False),
+            KeyEvent(490 * MS, " ", "", False),
+            KeyEvent(590 * MS, "c", "c", True),
+        ])
+        self.assertEqual(reader.lines, ["añ", "b c"])
+        self.assertTrue(reader.complete)
+        self.assertEqual(reader.elapsed_ns, 30_000 * MS)
+
+    def test_file_is_only_created_when_opened(self):
+        writer: RecordingWriter = RecordingWriter(self.file_name, "en", 0, 1)
+        with self.assertRaises(FileNotFoundError):
+            open(file=self.file_name, mode="rb")
+        writer.open()
+        writer.close()
+        reader, events = self.read()
+        self.assertEqual(events, [])
+        self.assertFalse(reader.complete)
+
+    def test_unfinished_recording_is_incomplete(self):
+        self.write(finish=False)
+        reader, events = self.read()
+        self.assertEqual(len(events), 5)
+        self.assertFalse(reader.complete)
+
+    def test_every_cut_is_read_as_incomplete(self):
+        self.write()
+        with open(file=self.file_name, mode="rb") as file:
+            data: bytes = file.read()
+        for end in range(len(data) - 1, 0, -1):
+            with open(file=self.file_name, mode="wb") as file:
+                file.write(data[:end])
+            try:
+                reader: RecordingReader = RecordingReader(self.file_name)
+            except ValueError:
+                continue  # The header was cut
+            try:
+                events: list = list(reader)
+                self.assertFalse(reader.complete, end)
+                self.assertLessEqual(len(events), 5)
+            finally:
+                reader.close()
+
+    def test_other_files_are_rejected(self):
+        file_name: str = join(self.directory.name, "other.tsr")
+        with open(file=file_name, mode="wb") as file:
+            file.write(b"PK\x03\x04 not a recording")
+        with self.assertRaises(ValueError):
+            RecordingReader(file_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
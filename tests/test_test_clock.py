@@ -0,0 +1,113 @@
+"""
+Tests of the test countdown (src/test_clock.py), using a stand-in for the
+Tk 'after' loop with a fake clock, so no test really waits.
+Run them from the project directory:
+    python3 -m pytest tests
+"""
+from os.path import dirname, join
+from unittest import mock
+import heapq
+import sys
+import unittest
+
+sys.path.insert(0, join(dirname(dirname(__file__)), "src"))
+
+import test_clock  # noqa: E402
+
+
+class AfterLoop:
+    def __init__(self, late_ms: float = 0.0):
+        # The callbacks scheduled with 'after', run in order of their time.
+        # Every callback runs late_ms after it's due, like a busy Tk loop
+        self.now: float = 1000.0  # Seconds of the fake monotonic clock
+        self.late_ms: float = late_ms
+        self.pending: list = []  # [(due, id, callback)]
+        self.next_id: int = 0
+
+    def monotonic(self) -> float:
+        """Return the time of the fake clock"""
+        return self.now
+
+    def after(self, delay_ms: int, callback) -> int:
+        """Schedule the callback like Tk's 'after', return its id"""
+        self.next_id += 1
+        heapq.heappush(
+            self.pending, (self.now + delay_ms / 1000, self.next_id, callback)
+        )
+        return self.next_id
+
+    def after_cancel(self, after_id: int) -> None:
+        """Cancel a scheduled callback"""
+        self.pending = [item for item in self.pending if item[1] != after_id]
+        heapq.heapify(self.pending)
+        return None
+
+    def run(self) -> None:
+        """Run the callbacks, moving the clock to the time they run at"""
+        while self.pending:
+            due, _, callback = heapq.heappop(self.pending)
+            self.now = max(self.now, due + self.late_ms / 1000)
+            callback()
+        return None
+
+
+class TestClockTest(unittest.TestCase):
+    def create_clock(self, late_ms: float = 0.0):
+        """Return a clock driven by a fake loop, and the loop"""
+        self.ticks: list = []
+        self.finished: int = 0
+        loop: AfterLoop = AfterLoop(late_ms)
+        patcher = mock.patch.object(
+            test_clock.time, "monotonic", loop.monotonic
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clock = test_clock.TestClock(
+            loop, self.ticks.append, self.finish, interval_ms=100
+        )
+        return clock, loop
+
+    def finish(self) -> None:
+        self.finished += 1
+
+    def test_finishes_on_its_deadline(self):
+        clock, loop = self.create_clock()
+        started: float = loop.now
+        clock.start(30)
+        loop.run()
+        self.assertEqual(self.finished, 1)
+        self.assertFalse(clock.running)
+        self.assertAlmostEqual(clock.drift, 0.0, places=9)
+        self.assertAlmostEqual(loop.now - started, 30, places=6)
+        self.assertEqual(self.ticks[-1], 0.0)
+        self.assertEqual(self.ticks, sorted(self.ticks, reverse=True))
+
+    def test_late_callbacks_dont_add_up(self):
+        # 300 ticks, each 3 ms late: the drift is one delay, not all of them
+        clock, loop = self.create_clock(late_ms=3)
+        started: float = loop.now
+        clock.start(30)
+        loop.run()
+        self.assertEqual(self.finished, 1)
+        self.assertLessEqual(clock.drift, 0.003 + 1e-9)
+        self.assertLess(loop.now - started, 30.005)
+
+    def test_stop_cancels_the_finish(self):
+        clock, loop = self.create_clock()
+        clock.start(1)
+        loop.after(300, clock.stop)
+        loop.run()
+        self.assertEqual(self.finished, 0)
+        self.assertEqual(loop.pending, [])
+
+    def test_restart_finishes_once(self):
+        clock, loop = self.create_clock()
+        clock.start(1)
+        clock.start(0.5)
+        loop.run()
+        self.assertEqual(self.finished, 1)
+        self.assertAlmostEqual(clock.drift, 0.0, places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()